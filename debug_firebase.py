@@ -4,15 +4,18 @@ Debug script to check Firebase prompt data structure
 """
 import os
 import sys
-import json
+import argparse
+
+import orjson
+from loguru import logger
 
 # Add the server directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'server'))
 
 from services.firebase_service import get_firebase_service
 
-def debug_firebase_data():
-    """Check what's actually in Firebase"""
+def debug_firebase_data(fields=None):
+    """Check what's actually in Firebase, optionally projecting to the given fields"""
     try:
         firebase_service = get_firebase_service()
         
@@ -22,27 +25,38 @@ def debug_firebase_data():
             
         print("🔍 Checking Firebase prompts collection...")
         
-        # Get all documents in the prompts collection
-        docs = firebase_service.db.collection('prompts').stream()
+        # Get all documents in the prompts collection, letting Firestore
+        # drop unneeded fields server-side when a projection is given
+        query = firebase_service.db.collection('prompts')
+        if fields:
+            query = query.select(fields)
+        docs = query.stream()
+        
+        # Write orjson's UTF-8 bytes straight to the buffer instead of decoding
+        # each document back into a str for print()
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+        separator = b"\n" + b"-" * 50 + b"\n"
         
         documents_found = 0
         for doc in docs:
             documents_found += 1
-            print(f"\n📄 Document ID: {doc.id}")
-            data = doc.to_dict()
-            print(f"📊 Data structure:")
-            print(json.dumps(data, indent=2, default=str))
-            print("-" * 50)
+            out.write(f"\n📄 Document ID: {doc.id}\n📊 Data structure:\n".encode())
+            out.write(orjson.dumps(doc.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC, default=str))
+            out.write(separator)
+        out.flush()
             
         if documents_found == 0:
             print("❌ No documents found in 'prompts' collection")
         else:
             print(f"✅ Found {documents_found} documents")
             
-    except Exception as e:
-        print(f"💥 Error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("💥 Failed to read Firebase prompts")
 
 if __name__ == "__main__":
-    debug_firebase_data()
+    parser = argparse.ArgumentParser(description="Inspect the Firebase prompts collection")
+    parser.add_argument("--fields", help="Comma-separated fields to fetch (default: all)")
+    args = parser.parse_args()
+    
+    debug_firebase_data(args.fields.split(",") if args.fields else None)
@@ -5,16 +5,19 @@ Authentication Test Server with Firebase
 import sys
 import os
 import asyncio
+import argparse
+import importlib.util
 sys.path.append('/Users/sukhmansinghnarula/Documents/Code/Bern/pipecat server/server')
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from loguru import logger
 
 # Import auth service
 from services.auth_service import get_auth_service
 
-app = FastAPI(title="ESP32 Authentication Server", version="1.0.0")
+app = FastAPI(title="ESP32 Authentication Server", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Initialize auth service
 auth_service = get_auth_service()
@@ -253,6 +256,27 @@ async def get_active_devices():
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ESP32 Authentication Server")
+    parser.add_argument("--host", default=os.getenv("AUTH_SERVER_HOST", "0.0.0.0"), help="Host to bind to")
+    parser.add_argument("--port", type=int, default=int(os.getenv("AUTH_SERVER_PORT", "8080")), help="Port to bind to")
+    parser.add_argument("--log-level", default="info", help="Log level")
+    # With Firebase enabled every request is a Firestore round trip with no
+    # per-process state, so one worker per core scales throughput; the in-memory
+    # fallback is per process and needs a single worker
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")), help="Number of uvicorn worker processes (default: WEB_CONCURRENCY or 1)")
+    args = parser.parse_args()
+    
     logger.info("🔥 Starting ESP32 Authentication Server with Firebase...")
     logger.info(f"🔥 Firebase enabled: {auth_service.firebase.use_firebase}")
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Multiple workers need an import string so each process builds its own app and clients
+    uvicorn.run(
+        "firebase_auth_server:app" if args.workers > 1 else app,
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        workers=args.workers,
+        # uvloop is skipped on Windows; fall back to the stock loop there
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools",
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT_SECS", "75"))
+    )
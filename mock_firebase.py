@@ -1,71 +1,280 @@
 """
 Mock Firebase service for testing authentication endpoints
 """
-from typing import Optional, Dict, Any, List
+import operator
+from bisect import bisect_left, bisect_right, insort
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
+from collections import ChainMap
+from collections.abc import Hashable
+from types import MappingProxyType
+
+# Index key for documents whose field is missing or unhashable; they are kept
+# as '==' candidates and settled by the compiled filter
+_UNINDEXED = object()
+
+# Filter operator -> predicate that is true when a document fails the filter
+_REJECTS = {'==': operator.ne, '!=': operator.eq}
+
+
+def _compile_filters(filters: Optional[List[Dict[str, Any]]]):
+    """Compile query filters into a predicate over (doc_id, doc_data), reusing cached plans"""
+    # Unknown operators are ignored
+    checks = tuple(
+        (filter_item.get('field'), filter_item.get('operator', '=='), filter_item.get('value'))
+        for filter_item in filters or ()
+        if filter_item.get('operator', '==') in _REJECTS
+    )
+    try:
+        return _compile_checks(checks)
+    except TypeError:
+        # Unhashable filter values (e.g. lists) can't key the cache
+        return _compile_checks.__wrapped__(checks)
+
+
+@lru_cache(maxsize=256)
+def _compile_checks(checks: tuple):
+    """Build the predicate for one (field, operator, value) filter signature"""
+    if not checks:
+        return lambda doc_id, doc_data: True
+    
+    resolved = [(field, _REJECTS[op], value) for field, op, value in checks]
+    
+    def matches(doc_id: str, doc_data: Dict[str, Any]) -> bool:
+        for field, rejects, value in resolved:
+            if field in doc_data:
+                current = doc_data[field]
+            elif field == 'id':
+                current = doc_id
+            else:
+                # As in Firestore, documents without the field never match
+                return False
+            if rejects(current, value):
+                return False
+        return True
+    
+    return matches
+
+
+def _document_view(doc_id: str, doc_data: Dict[str, Any]):
+    """Read-only view of a stored document with its id layered on top, without copying"""
+    return MappingProxyType(ChainMap({'id': doc_id}, doc_data))
 
 class MockFirebaseService:
-    """Mock Firebase service for testing"""
+    """Mock Firebase service for testing; synchronous, as every operation is in-memory"""
+    
+    __slots__ = ('data', 'indexes', 'indexed_values', 'sorted_ids', 'field_counts')
     
     def __init__(self):
         self.data = {}
+        # collection -> field -> value -> doc_ids holding that value
+        self.indexes: Dict[str, Dict[str, Dict[Any, Set[str]]]] = {}
+        # collection -> field -> doc_id -> indexed value, for O(1) removal
+        self.indexed_values: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # collection -> document ids in sorted order, for ordered scans and id ranges
+        self.sorted_ids: Dict[str, List[str]] = {}
+        # collection -> field -> number of documents holding it, so filters on absent fields skip the scan
+        self.field_counts: Dict[str, Dict[str, int]] = {}
     
-    async def set_document(self, collection: str, document_id: str, data: Dict[str, Any]):
+    def create_index(self, collection: str, field: str):
+        """Index a field so '==' filters on it skip the full collection scan"""
+        index = self.indexes.setdefault(collection, {}).setdefault(field, {})
+        members = self.indexed_values.setdefault(collection, {}).setdefault(field, {})
+        for doc_id, doc_data in self.data.get(collection, {}).items():
+            self._index_value(index, members, doc_id, doc_data, field)
+    
+    def _index_value(self, index, members, doc_id: str, doc_data: Dict[str, Any], field: str):
+        """Add one document's field value to an index"""
+        value = doc_data.get(field, _UNINDEXED)
+        if not isinstance(value, Hashable):
+            value = _UNINDEXED
+        index.setdefault(value, set()).add(doc_id)
+        members[doc_id] = value
+    
+    def _unindex_document(self, collection: str, document_id: str):
+        """Remove a document from every index on its collection"""
+        indexes = self.indexes.get(collection)
+        if not indexes:
+            return
+        indexed_values = self.indexed_values[collection]
+        for field, index in indexes.items():
+            members = indexed_values[field]
+            if document_id not in members:
+                continue
+            value = members.pop(document_id)
+            doc_ids = index[value]
+            doc_ids.discard(document_id)
+            if not doc_ids:
+                del index[value]
+    
+    def _reindex_document(self, collection: str, document_id: str, doc_data: Dict[str, Any]):
+        """Refresh every index on a collection for one document"""
+        indexes = self.indexes.get(collection)
+        if not indexes:
+            return
+        self._unindex_document(collection, document_id)
+        indexed_values = self.indexed_values[collection]
+        for field, index in indexes.items():
+            self._index_value(index, indexed_values[field], document_id, doc_data, field)
+    
+    def _count_fields(self, collection: str, fields, delta: int):
+        """Adjust the per-field document counts for one document's fields"""
+        counts = self.field_counts.setdefault(collection, {})
+        for field in fields:
+            count = counts.get(field, 0) + delta
+            if count:
+                counts[field] = count
+            else:
+                del counts[field]
+    
+    def set_document(self, collection: str, document_id: str, data: Dict[str, Any]):
         """Set document in mock storage"""
-        if collection not in self.data:
-            self.data[collection] = {}
-        self.data[collection][document_id] = data
+        documents = self.data.setdefault(collection, {})
+        previous = documents.get(document_id)
+        if previous is None:
+            insort(self.sorted_ids.setdefault(collection, []), document_id)
+        else:
+            self._count_fields(collection, previous, -1)
+        self._count_fields(collection, data, 1)
+        documents[document_id] = data
+        self._reindex_document(collection, document_id, data)
         return True
     
-    async def get_document(self, collection: str, document_id: str) -> Optional[Dict[str, Any]]:
-        """Get document from mock storage"""
-        if collection in self.data and document_id in self.data[collection]:
-            return self.data[collection][document_id]
-        return None
+    def get_document(self, collection: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """Get a read-only view of a document from mock storage"""
+        documents = self.data.get(collection)
+        doc_data = documents.get(document_id) if documents is not None else None
+        return MappingProxyType(doc_data) if doc_data is not None else None
     
-    async def update_document(self, collection: str, document_id: str, data: Dict[str, Any]):
+    def get_documents(self, collection: str, document_ids: List[str]) -> Dict[str, Any]:
+        """Get read-only views of several documents, keyed by document ID"""
+        documents = self.data.get(collection)
+        if documents is None:
+            return {}
+        return {
+            document_id: MappingProxyType(documents[document_id])
+            for document_id in document_ids
+            if document_id in documents
+        }
+    
+    def update_document(self, collection: str, document_id: str, data: Dict[str, Any]):
         """Update document in mock storage"""
-        if collection not in self.data:
-            self.data[collection] = {}
-        if document_id not in self.data[collection]:
-            self.data[collection][document_id] = {}
-        self.data[collection][document_id].update(data)
+        documents = self.data.setdefault(collection, {})
+        doc_data = documents.get(document_id)
+        if doc_data is None:
+            doc_data = documents[document_id] = {}
+            insort(self.sorted_ids.setdefault(collection, []), document_id)
+        self._count_fields(collection, [field for field in data if field not in doc_data], 1)
+        doc_data.update(data)
+        self._reindex_document(collection, document_id, doc_data)
         return True
     
-    async def query_collection(self, collection: str, filters: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    def _candidate_ids(self, collection: str, filters: List[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Narrow a query to a superset of its matches using indexed '==' and '!=' filters"""
+        indexes = self.indexes.get(collection)
+        if not indexes:
+            return None
+        
+        equal, not_equal = [], []
+        for filter_item in filters:
+            field = filter_item.get('field')
+            value = filter_item.get('value')
+            if field not in indexes or not isinstance(value, Hashable):
+                continue
+            operator_name = filter_item.get('operator', '==')
+            if operator_name == '==':
+                equal.append((indexes[field], value))
+            elif operator_name == '!=':
+                not_equal.append((indexes[field], value))
+        
+        candidates = None
+        for index, value in equal:
+            ids = index.get(value, set()) | index.get(_UNINDEXED, set())
+            candidates = ids if candidates is None else candidates & ids
+        
+        # Documents indexed under the excluded value are exactly the ones '!=' rejects
+        for index, value in not_equal:
+            excluded = index.get(value)
+            if not excluded:
+                continue
+            if candidates is None:
+                candidates = self.data[collection].keys() - excluded
+            else:
+                candidates -= excluded
+        return candidates
+    
+    def query_collection(self, collection: str, filters: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Query collection from mock storage"""
-        if collection not in self.data:
+        documents = self.data.get(collection)
+        if documents is None:
             return []
         
-        results = []
-        for doc_id, doc_data in self.data[collection].items():
-            doc_data['id'] = doc_id
-            
-            if filters:
-                match = True
-                for filter_item in filters:
-                    field = filter_item.get('field')
-                    operator = filter_item.get('operator', '==')
-                    value = filter_item.get('value')
-                    
-                    if field in doc_data:
-                        if operator == '==' and doc_data[field] != value:
-                            match = False
-                            break
-                        elif operator == '!=' and doc_data[field] == value:
-                            match = False
-                            break
-                
-                if match:
-                    results.append(doc_data)
-            else:
-                results.append(doc_data)
+        # A filter on a field no document holds can match nothing
+        if filters:
+            counts = self.field_counts.get(collection, {})
+            for filter_item in filters:
+                field = filter_item.get('field')
+                if field != 'id' and field not in counts and filter_item.get('operator', '==') in _REJECTS:
+                    return []
+        
+        # Results come back in document id order, as Firestore returns them
+        candidates = self._candidate_ids(collection, filters) if filters else None
+        if candidates is None:
+            items = [(doc_id, documents[doc_id]) for doc_id in self.sorted_ids[collection]]
+        else:
+            items = [(doc_id, documents[doc_id]) for doc_id in sorted(candidates)]
         
-        return results
+        # Matches are returned as read-only views carrying their id; stored documents are never written
+        matches = _compile_filters(filters)
+        return [_document_view(doc_id, doc_data) for doc_id, doc_data in items if matches(doc_id, doc_data)]
     
-    async def delete_document(self, collection: str, document_id: str):
+    def delete_document(self, collection: str, document_id: str):
         """Delete document from mock storage"""
-        if collection in self.data and document_id in self.data[collection]:
-            del self.data[collection][document_id]
-            return True
-        return False
+        documents = self.data.get(collection)
+        doc_data = documents.pop(document_id, None) if documents is not None else None
+        if doc_data is None:
+            return False
+        self._count_fields(collection, doc_data, -1)
+        sorted_ids = self.sorted_ids[collection]
+        del sorted_ids[bisect_left(sorted_ids, document_id)]
+        self._unindex_document(collection, document_id)
+        return True
+    
+    def range_query(self, collection: str, start_id: Optional[str] = None, end_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get documents whose id falls in [start_id, end_id], in id order"""
+        documents = self.data.get(collection)
+        if documents is None:
+            return []
+        
+        sorted_ids = self.sorted_ids[collection]
+        lo = bisect_left(sorted_ids, start_id) if start_id is not None else 0
+        hi = bisect_right(sorted_ids, end_id) if end_id is not None else len(sorted_ids)
+        return [_document_view(doc_id, documents[doc_id]) for doc_id in sorted_ids[lo:hi]]
+
+
+class AsyncMockFirebaseService(MockFirebaseService):
+    """Awaitable mock for services that await FirebaseService calls"""
+    
+    __slots__ = ()
+    
+    async def set_document(self, collection: str, document_id: str, data: Dict[str, Any]):
+        return super().set_document(collection, document_id, data)
+    
+    async def get_document(self, collection: str, document_id: str) -> Optional[Dict[str, Any]]:
+        return super().get_document(collection, document_id)
+    
+    async def get_documents(self, collection: str, document_ids: List[str]) -> Dict[str, Any]:
+        return super().get_documents(collection, document_ids)
+    
+    async def update_document(self, collection: str, document_id: str, data: Dict[str, Any]):
+        return super().update_document(collection, document_id, data)
+    
+    async def query_collection(self, collection: str, filters: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        return super().query_collection(collection, filters)
+    
+    async def delete_document(self, collection: str, document_id: str):
+        return super().delete_document(collection, document_id)
+    
+    async def range_query(self, collection: str, start_id: Optional[str] = None, end_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return super().range_query(collection, start_id, end_id)
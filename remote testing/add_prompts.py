@@ -5,18 +5,57 @@ FIXED VERSION - Using correct /prompts/ endpoint
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Server configuration
 SERVER_HOST = "64.227.157.74"
 SERVER_PORT = 7860
 BASE_URL = f"http://{SERVER_HOST}:{SERVER_PORT}"
 
+# Shared session so every request reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+# Season 1 prompt payloads, edited as data rather than Python literals
+PROMPTS_FILE = Path(__file__).parent / "prompts_season1.json"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _encode(payload):
+    """Serialize a JSON request body straight to bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+def _decode(response):
+    """Parse a JSON response body straight from its bytes"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Serializes each upload's buffered output when uploads run in parallel
+PRINT_LOCK = threading.Lock()
+
 def add_system_prompt(season, episode, prompt, prompt_type="learning", metadata=None):
     """Add a new system prompt to the database using the correct endpoint"""
     
+    # Buffer this upload's output and print it in one block so parallel uploads don't interleave
+    output = []
+    
+    def log(*args):
+        output.append(" ".join(str(arg) for arg in args))
+    
     prompt_data = {
         "season": season,
         "episode": episode,
@@ -25,238 +64,122 @@ def add_system_prompt(season, episode, prompt, prompt_type="learning", metadata=
         "metadata": metadata or {}
     }
     
-    print(f"🚀 Adding System Prompt to Enhanced Pipecat Server")
-    print(f"Server: {BASE_URL}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    log(f"🚀 Adding System Prompt to Enhanced Pipecat Server")
+    log(f"Server: {BASE_URL}")
+    log(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    log("=" * 60)
     
-    print(f"📚 System Prompt Data:")
-    print(f"  Season: {season}")
-    print(f"  Episode: {episode}")
-    print(f"  Prompt Type: {prompt_type}")
-    print(f"  Prompt Length: {len(prompt)} characters")
-    print(f"  Metadata Keys: {list(metadata.keys()) if metadata else []}")
-    print()
+    log(f"📚 System Prompt Data:")
+    log(f"  Season: {season}")
+    log(f"  Episode: {episode}")
+    log(f"  Prompt Type: {prompt_type}")
+    log(f"  Prompt Length: {len(prompt)} characters")
+    log(f"  Metadata Keys: {list(metadata.keys()) if metadata else []}")
+    log()
     
     try:
-        print("📨 Sending request to create system prompt...")
+        log("📨 Sending request to create system prompt...")
         # Using the correct endpoint: /prompts/ instead of /episodes/create
-        response = requests.post(f"{BASE_URL}/prompts/", json=prompt_data, timeout=15)
+        response = SESSION.post(f"{BASE_URL}/prompts/", data=_encode(prompt_data), headers=JSON_HEADERS, timeout=15)
         
-        print(f"📤 Response Status: {response.status_code}")
+        log(f"📤 Response Status: {response.status_code}")
         
         if response.status_code == 201:  # Note: 201 for creation, not 200
-            print("✅ System prompt created successfully!")
-            created_prompt = response.json()
-            print(f"📋 Created Prompt Details:")
-            print(f"  - Season: {created_prompt.get('season')}")
-            print(f"  - Episode: {created_prompt.get('episode')}")
-            print(f"  - Type: {created_prompt.get('prompt_type')}")
-            print(f"  - Length: {created_prompt.get('prompt_length')} characters")
-            print(f"  - Version: {created_prompt.get('version')}")
-            print(f"  - Active: {created_prompt.get('is_active')}")
-            print(f"  - Created: {created_prompt.get('created_at')}")
+            log("✅ System prompt created successfully!")
+            created_prompt = _decode(response)
+            log(f"📋 Created Prompt Details:")
+            log(f"  - Season: {created_prompt.get('season')}")
+            log(f"  - Episode: {created_prompt.get('episode')}")
+            log(f"  - Type: {created_prompt.get('prompt_type')}")
+            log(f"  - Length: {created_prompt.get('prompt_length')} characters")
+            log(f"  - Version: {created_prompt.get('version')}")
+            log(f"  - Active: {created_prompt.get('is_active')}")
+            log(f"  - Created: {created_prompt.get('created_at')}")
             
             return True
             
         else:
-            print("❌ Failed to create system prompt")
+            log("❌ Failed to create system prompt")
             try:
-                error_data = response.json()
-                print(f"🚨 Error Details:")
-                print(json.dumps(error_data, indent=2))
+                error_data = _decode(response)
+                log(f"🚨 Error Details:")
+                log(json.dumps(error_data, indent=2))
             except:
-                print(f"🚨 Raw Error Response: {response.text}")
+                log(f"🚨 Raw Error Response: {response.text}")
             
             return False
             
     except requests.exceptions.ConnectionError:
-        print("❌ Could not connect to server!")
-        print(f"   Make sure the server is running on {BASE_URL}")
+        log("❌ Could not connect to server!")
+        log(f"   Make sure the server is running on {BASE_URL}")
         return False
         
     except requests.exceptions.Timeout:
-        print("❌ Request timed out!")
+        log("❌ Request timed out!")
         return False
         
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        log(f"❌ Unexpected error: {e}")
         return False
-
-def main():
-    """Main function with predefined system prompts"""
     
-    # System prompts for Season 1 - designed for AI tutors
-    prompts_to_add = [
-        {
-            "season": 1,
-            "episode": 1,
-            "prompt": """You are a friendly and patient English tutor for young children learning their first English words. 
-
-Your student is learning basic greetings. Your goals:
-- Teach basic greeting words: hello, hi, goodbye, bye, good morning
-- Use simple, clear pronunciation  
-- Be encouraging and positive
-- Repeat words multiple times
-- Ask the child to repeat after you
-- Keep responses short and age-appropriate
-- Use a warm, friendly tone
-
-Start by greeting the child warmly and introducing today's lesson about saying hello and goodbye.
-Remember: Your output will be converted to audio, so avoid special characters and speak naturally.""",
-            "prompt_type": "learning",
-            "metadata": {
-                "title": "First Words - Greetings",
-                "words_to_teach": ["hello", "hi", "goodbye", "bye", "good morning"],
-                "topics": ["greetings", "basic_politeness", "daily_interactions"],
-                "difficulty": "beginner",
-                "age_group": "children",
-                "learning_objectives": [
-                    "Learn 4-5 basic greeting words",
-                    "Practice pronunciation of greetings", 
-                    "Understand when to use different greetings",
-                    "Build confidence in speaking English"
-                ]
-            }
-        },
-        {
-            "season": 1,
-            "episode": 2,
-            "prompt": """You are a friendly and patient English tutor for young children learning about family members.
-
-Your student is learning family vocabulary. Your goals:
-- Teach family words: mom, dad, sister, brother, grandma, grandpa, family
-- Help them identify family relationships
-- Practice pronunciation clearly
-- Encourage them to talk about their own family
-- Use simple sentences and questions
-- Be warm and encouraging
-
-Start by asking about their family and then teaching the family member words.
-Remember: Your output will be converted to audio, so speak naturally and clearly.""",
-            "prompt_type": "learning",
-            "metadata": {
-                "title": "Family Members",
-                "words_to_teach": ["mom", "dad", "sister", "brother", "grandma", "grandpa", "family"],
-                "topics": ["family_relationships", "personal_identity", "basic_vocabulary"],
-                "difficulty": "beginner",
-                "age_group": "children",
-                "learning_objectives": [
-                    "Learn 6-7 family member words",
-                    "Practice talking about family",
-                    "Build personal vocabulary",
-                    "Develop conversational skills"
-                ]
-            }
-        },
-        {
-            "season": 1,
-            "episode": 3,
-            "prompt": """You are a friendly and patient English tutor for young children learning colors and numbers.
-
-Your student is learning colors and basic counting. Your goals:
-- Teach basic colors: red, blue, yellow, green, orange, purple
-- Teach numbers 1-10
-- Make learning fun and interactive
-- Ask them to identify colors and count things
-- Use simple, clear pronunciation
-- Be encouraging and celebrate their progress
+    finally:
+        log("=" * 60)
+        # One write per upload rather than one per line
+        output.append("\n")
+        with PRINT_LOCK:
+            sys.stdout.write("\n".join(output))
+            sys.stdout.flush()
 
-Start by showing excitement about learning colors and numbers today.
-Remember: Your output will be converted to audio, so speak naturally and with enthusiasm.""",
-            "prompt_type": "learning",
-            "metadata": {
-                "title": "Colors and Numbers",
-                "words_to_teach": ["red", "blue", "yellow", "green", "orange", "purple", "one", "two", "three", "four", "five"],
-                "topics": ["colors", "numbers", "counting", "visual_learning"],
-                "difficulty": "beginner",
-                "age_group": "children",
-                "learning_objectives": [
-                    "Learn 6 basic colors",
-                    "Learn numbers 1-10",
-                    "Practice counting skills",
-                    "Develop color recognition vocabulary"
-                ]
-            }
-        },
-        {
-            "season": 1,
-            "episode": 4,
-            "prompt": """You are an enthusiastic English tutor teaching young children about animals and their sounds.
-
-Your student is learning about animals and the sounds they make. Your goals:
-- Teach common animals: cat, dog, cow, pig, duck, sheep
-- Teach animal sounds: meow, woof, moo, oink, quack, baa
-- Make it fun with sound effects
-- Encourage them to make the sounds
-- Practice both animal names and their sounds
-- Use playful, engaging tone
-
-Start by getting excited about learning animal sounds today!
-Remember: Your output will be converted to audio, so have fun with the animal sounds.""",
-            "prompt_type": "learning",
-            "metadata": {
-                "title": "Animals and Sounds",
-                "words_to_teach": ["cat", "dog", "cow", "pig", "duck", "sheep", "meow", "woof", "moo", "oink", "quack"],
-                "topics": ["animals", "sounds", "onomatopoeia", "nature"],
-                "difficulty": "beginner",
-                "age_group": "children",
-                "learning_objectives": [
-                    "Learn 6 common animals",
-                    "Learn animal sound words", 
-                    "Practice making sounds",
-                    "Have fun with language learning"
-                ]
-            }
-        },
-        {
-            "season": 1,
-            "episode": 5,
-            "prompt": """You are a friendly English tutor teaching young children about food and drinks.
+def add_system_prompts_bulk(prompts):
+    """Add several system prompts in one request; returns None if the server has no bulk endpoint"""
+    print(f"🚀 Adding {len(prompts)} System Prompts in bulk to {BASE_URL}")
+    
+    try:
+        response = SESSION.post(
+            f"{BASE_URL}/prompts/bulk",
+            data=_encode(prompts),
+            headers=JSON_HEADERS,
+            timeout=30
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Bulk upload failed: {e}")
+        return 0
+    
+    if response.status_code in (404, 405):
+        print("ℹ️  Server has no /prompts/bulk endpoint, uploading one by one")
+        return None
+    
+    if response.status_code != 201:
+        print(f"❌ Bulk upload failed with status {response.status_code}")
+        try:
+            print(json.dumps(_decode(response), indent=2))
+        except ValueError:
+            print(f"🚨 Raw Error Response: {response.text}")
+        return 0
+    
+    created_prompts = _decode(response)
+    for created_prompt in created_prompts:
+        print(f"✅ Season {created_prompt.get('season')} Episode {created_prompt.get('episode')}: "
+              f"{created_prompt.get('prompt_length')} characters, version {created_prompt.get('version')}")
+    print("=" * 60)
+    return len(created_prompts)
 
-Your student is learning food vocabulary and expressing preferences. Your goals:
-- Teach common foods: apple, banana, bread, milk, water, juice
-- Talk about likes and dislikes: "I like..." "I don't like..."
-- Practice food-related conversations
-- Ask about their favorite foods
-- Use encouraging, positive tone
-- Make food vocabulary practical and useful
+def load_prompts():
+    """Load the Season 1 system prompts that ship next to this script"""
+    with open(PROMPTS_FILE, "rb") as f:
+        content = f.read()
+    return orjson.loads(content) if orjson is not None else json.loads(content)
 
-Start by asking what they like to eat and drink!
-Remember: Your output will be converted to audio, so speak clearly and warmly.""",
-            "prompt_type": "learning",
-            "metadata": {
-                "title": "Food and Drinks",
-                "words_to_teach": ["apple", "banana", "bread", "milk", "water", "juice", "like", "eat", "drink"],
-                "topics": ["food", "drinks", "preferences", "daily_life"],
-                "difficulty": "beginner",
-                "age_group": "children",
-                "learning_objectives": [
-                    "Learn 6-8 food and drink words",
-                    "Practice expressing preferences",
-                    "Build everyday vocabulary",
-                    "Develop conversation skills"
-                ]
-            }
-        }
-    ]
+def main():
+    """Main function with predefined system prompts"""
     
-    success_count = 0
+    # System prompts for Season 1 - designed for AI tutors
+    prompts_to_add = load_prompts()
     
-    for prompt_data in prompts_to_add:
-        success = add_system_prompt(
-            season=prompt_data["season"],
-            episode=prompt_data["episode"],
-            prompt=prompt_data["prompt"],
-            prompt_type=prompt_data["prompt_type"],
-            metadata=prompt_data["metadata"]
-        )
-        
-        if success:
-            success_count += 1
-            
-        print("=" * 60)
-        print()
+    # One request and one batched write; older servers fall back to parallel single uploads
+    success_count = add_system_prompts_bulk(prompts_to_add)
+    if success_count is None:
+        success_count = upload_prompts_individually(prompts_to_add)
     
     print(f"🏁 Summary: {success_count}/{len(prompts_to_add)} system prompts added successfully")
     
@@ -268,6 +191,22 @@ Remember: Your output will be converted to audio, so speak clearly and warmly.""
         print("⚠️  Some system prompts failed to be added.")
         return 1
 
+def upload_prompts_individually(prompts_to_add):
+    """Upload prompts one request each, in parallel over the shared session"""
+    with ThreadPoolExecutor(max_workers=len(prompts_to_add)) as executor:
+        futures = [
+            executor.submit(
+                add_system_prompt,
+                season=prompt_data["season"],
+                episode=prompt_data["episode"],
+                prompt=prompt_data["prompt"],
+                prompt_type=prompt_data["prompt_type"],
+                metadata=prompt_data["metadata"]
+            )
+            for prompt_data in prompts_to_add
+        ]
+        return sum(1 for future in futures if future.result())
+
 def add_custom_prompt():
     """Interactive function to add a custom system prompt"""
     print("🛠️  Custom System Prompt Creation")
@@ -5,23 +5,89 @@ Run this after setting up your Enhanced Pipecat Server
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Server configuration
 SERVER_HOST = "64.227.157.74" 
 SERVER_PORT = 7860
 BASE_URL = f"http://{SERVER_HOST}:{SERVER_PORT}"
 
+# Shared session so every request reuses the same keep-alive connection; transient
+# gateway/overload responses are retried briefly (honouring Retry-After)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods={"GET", "POST"})
+))
+
+# Test payloads, serialized once and sent as raw bytes on every run
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _encode(payload):
+    """Serialize a JSON request body once"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+def _decode(response):
+    """Parse a JSON response body straight from its bytes"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+TEST_USER_BODY = _encode({
+    "device_id": "TEST0001",
+    "name": "Test Child",
+    "age": 8,
+    "email": "test.child@example.com",
+    "parent": {
+        "name": "Test Parent",
+        "age": 35,
+        "email": "test.parent@example.com"
+    }
+})
+
+TEST_EPISODE_BODY = _encode({
+    "season": 1,
+    "episode": 1,
+    "title": "Test Episode - Basic Greetings",
+    "system_prompt": """You are a friendly AI tutor teaching basic English greetings. 
+        
+Your student is {name}, age {age}. Teach them to say hello, hi, goodbye, and bye.
+Be encouraging and speak clearly since your output becomes audio.
+Start by greeting the child warmly.""",
+    "words_to_teach": ["hello", "hi", "goodbye", "bye"],
+    "topics_to_cover": ["greetings", "politeness"],
+    "difficulty_level": "beginner",
+    "age_group": "children",
+    "learning_objectives": ["Learn basic greetings", "Practice pronunciation"]
+})
+
+# Simple test offer
+TEST_OFFER_BODY = _encode({
+    "type": "offer",
+    "device_id": "TEST0001",
+    "sdp": "v=0\no=- 123 123 IN IP4 192.168.1.1\ns=-\nt=0 0\nm=audio 9 UDP/TLS/RTP/SAVPF 111"
+})
+
 def test_server_health():
     """Test basic server connectivity"""
     print("🔍 Testing server health...")
     
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=2)
         if response.status_code == 200:
-            health = response.json()
+            health = _decode(response)
             print(f"✅ Server is healthy: {health.get('status')}")
             print(f"   ESP32 mode: {health.get('esp32_mode')}")
             
@@ -41,20 +107,8 @@ def quick_add_user():
     """Add a test user"""
     print("👤 Adding test user...")
     
-    user_data = {
-        "device_id": "TEST0001",
-        "name": "Test Child",
-        "age": 8,
-        "email": "test.child@example.com",
-        "parent": {
-            "name": "Test Parent",
-            "age": 35,
-            "email": "test.parent@example.com"
-        }
-    }
-    
     try:
-        response = requests.post(f"{BASE_URL}/users/create", json=user_data, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/users/create", data=TEST_USER_BODY, headers=JSON_HEADERS, timeout=10)
         if response.status_code == 200:
             print("✅ Test user created successfully")
             return True
@@ -70,24 +124,8 @@ def quick_add_episode():
     """Add a test episode prompt"""
     print("📚 Adding test episode...")
     
-    episode_data = {
-        "season": 1,
-        "episode": 1,
-        "title": "Test Episode - Basic Greetings",
-        "system_prompt": """You are a friendly AI tutor teaching basic English greetings. 
-        
-Your student is {name}, age {age}. Teach them to say hello, hi, goodbye, and bye.
-Be encouraging and speak clearly since your output becomes audio.
-Start by greeting the child warmly.""",
-        "words_to_teach": ["hello", "hi", "goodbye", "bye"],
-        "topics_to_cover": ["greetings", "politeness"],
-        "difficulty_level": "beginner",
-        "age_group": "children",
-        "learning_objectives": ["Learn basic greetings", "Practice pronunciation"]
-    }
-    
     try:
-        response = requests.post(f"{BASE_URL}/episodes/create", json=episode_data, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/episodes/create", data=TEST_EPISODE_BODY, headers=JSON_HEADERS, timeout=10)
         if response.status_code == 200:
             print("✅ Test episode created successfully")
             return True
@@ -102,18 +140,11 @@ def test_webrtc_endpoint():
     """Test WebRTC offer endpoint"""
     print("🌐 Testing WebRTC endpoint...")
     
-    # Simple test offer
-    test_offer = {
-        "type": "offer",
-        "device_id": "TEST0001",
-        "sdp": "v=0\no=- 123 123 IN IP4 192.168.1.1\ns=-\nt=0 0\nm=audio 9 UDP/TLS/RTP/SAVPF 111"
-    }
-    
     try:
-        response = requests.post(f"{BASE_URL}/api/offer", json=test_offer, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/api/offer", data=TEST_OFFER_BODY, headers=JSON_HEADERS, timeout=10)
         if response.status_code == 200:
             print("✅ WebRTC endpoint accepts offers")
-            answer = response.json()
+            answer = _decode(response)
             if "sdp" in answer:
                 print(f"   SDP answer length: {len(answer['sdp'])} chars")
             return True
@@ -130,9 +161,9 @@ def test_user_lookup():
     
     try:
         # Test by device ID
-        response = requests.get(f"{BASE_URL}/users/device/TEST0001", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/users/device/TEST0001", timeout=5)
         if response.status_code == 200:
-            user = response.json()
+            user = _decode(response)
             print(f"✅ User lookup works: {user.get('name')}")
             return True
         else:
@@ -147,9 +178,9 @@ def test_episode_lookup():
     print("📖 Testing episode lookup...")
     
     try:
-        response = requests.get(f"{BASE_URL}/episodes/season/1/episode/1", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/episodes/season/1/episode/1", timeout=5)
         if response.status_code == 200:
-            episode = response.json()
+            episode = _decode(response)
             print(f"✅ Episode lookup works: {episode.get('title')}")
             return True
         else:
@@ -197,14 +228,24 @@ def show_connection_summary():
 
 def main():
     """Run all quick tests"""
+    # Buffer output and flush once per test instead of writing on every line
+    sys.stdout.reconfigure(line_buffering=False)
+    
     print("🚀 ENHANCED PIPECAT SERVER - QUICK TEST SUITE")
     print(f"Server: {BASE_URL}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*60)
     print()
     
+    # Gate the suite on health so a dead server fails fast instead of timing out every test
+    print(f"{'='*20} Server Health {'='*20}")
+    if not test_server_health():
+        print("\n🛑 Server is unreachable, skipping the remaining tests")
+        return 1
+    print()
+    sys.stdout.flush()
+    
     tests = [
-        ("Server Health", test_server_health),
         ("Add Test User", quick_add_user), 
         ("Add Test Episode", quick_add_episode),
         ("WebRTC Endpoint", test_webrtc_endpoint),
@@ -212,14 +253,15 @@ def main():
         ("Episode Lookup", test_episode_lookup)
     ]
     
-    passed = 0
-    total = len(tests)
+    passed = 1  # Server health
+    total = len(tests) + 1
     
     for test_name, test_func in tests:
         print(f"{'='*20} {test_name} {'='*20}")
         if test_func():
             passed += 1
         print()
+        sys.stdout.flush()
     
     print("="*60)
     print(f"📊 RESULTS: {passed}/{total} tests passed")
@@ -2,22 +2,44 @@
 Conversation API endpoints for managing conversation transcripts and summaries
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter
 from datetime import datetime
+from operator import attrgetter
 
 from services.conversation_service import ConversationService
 from services.firebase_service import get_firebase_service
+from utils.exceptions import ServiceException
+from utils.http_cache import etag_response
+from utils.validators import EmailValidator
 from models.conversation import ConversationTranscript, ConversationSummary, ConversationMessage
 
 # Initialize router
-router = APIRouter(prefix="/conversations", tags=["Conversations"])
+router = APIRouter(prefix="/conversations", tags=["Conversations"], default_response_class=ORJSONResponse)
+
+# Dependency to get services; the service is stateless, so one instance serves every request
+_conversation_service: Optional[ConversationService] = None
 
-# Dependency to get services
 def get_conversation_service():
-    firebase_service = get_firebase_service()
-    return ConversationService(firebase_service)
+    global _conversation_service
+    if _conversation_service is None:
+        _conversation_service = ConversationService(get_firebase_service())
+    return _conversation_service
+
+def valid_user_email(user_email: str) -> str:
+    """Path parameter dependency that validates and normalizes the email"""
+    normalized = EmailValidator.normalize_email(user_email)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail="Invalid email address")
+    return normalized
+
+# Finished transcripts and summaries don't change, so clients may reuse them for
+# an hour; anything else must be revalidated, which the ETag makes cheap
+IMMUTABLE_CACHE_CONTROL = "private, max-age=3600"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
 
 # Request/Response Models
 class StartConversationRequest(BaseModel):
@@ -75,6 +97,24 @@ class SummaryResponse(BaseModel):
     next_recommendations: List[str]
     created_at: datetime
 
+# Compiled once; list endpoints serialize straight to JSON bytes through it
+_CONVERSATION_LIST = TypeAdapter(List[ConversationResponse])
+# Builds a transcript's message responses in one pydantic-core pass, read off the dataclass attributes
+_MESSAGE_LIST = TypeAdapter(List[MessageResponse])
+
+_CONVERSATION_FIELDS = (
+    "conversation_id", "user_email", "season", "episode",
+    "status", "start_time", "end_time", "duration_seconds"
+)
+_conversation_fields = attrgetter(*_CONVERSATION_FIELDS)
+
+def _conversation_response(conversation: ConversationTranscript) -> ConversationResponse:
+    """Build a conversation response, with its messages, from a transcript"""
+    return ConversationResponse.model_construct(
+        **dict(zip(_CONVERSATION_FIELDS, _conversation_fields(conversation))),
+        messages=_MESSAGE_LIST.validate_python(conversation.messages, from_attributes=True)
+    )
+
 @router.post("/start")
 async def start_conversation(
     request: StartConversationRequest,
@@ -86,10 +126,10 @@ async def start_conversation(
             request.user_email, request.season, request.episode
         )
         return {"conversation_id": conversation_id, "message": "Conversation started successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except ServiceException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from None
 
-@router.post("/{conversation_id}/messages")
+@router.post("/{conversation_id}/messages", status_code=204)
 async def add_message(
     conversation_id: str,
     request: AddMessageRequest,
@@ -101,11 +141,12 @@ async def add_message(
     )
     if not success:
         raise HTTPException(status_code=400, detail="Failed to add message")
-    return {"message": "Message added successfully"}
+    return Response(status_code=204)
 
-@router.get("/{conversation_id}", response_model=ConversationResponse)
+@router.get("/{conversation_id}", responses={200: {"model": ConversationResponse}})
 async def get_conversation(
     conversation_id: str,
+    request: Request,
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get conversation transcript by ID"""
@@ -113,30 +154,10 @@ async def get_conversation(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    # Convert messages to response format
-    messages = [
-        MessageResponse(
-            speaker=msg.speaker,
-            content=msg.content,
-            message_type=msg.message_type,
-            timestamp=msg.timestamp
-        )
-        for msg in conversation.messages
-    ]
-    
-    return ConversationResponse(
-        conversation_id=conversation.conversation_id,
-        user_email=conversation.user_email,
-        season=conversation.season,
-        episode=conversation.episode,
-        status=conversation.status,
-        start_time=conversation.start_time,
-        end_time=conversation.end_time,
-        duration_seconds=conversation.duration_seconds,
-        messages=messages
-    )
+    cache_control = REVALIDATE_CACHE_CONTROL if conversation.status == "active" else IMMUTABLE_CACHE_CONTROL
+    return etag_response(request, conversation.to_json_bytes(), cache_control)
 
-@router.put("/{conversation_id}/finish")
+@router.put("/{conversation_id}/finish", status_code=204)
 async def finish_conversation(
     conversation_id: str,
     request: FinishConversationRequest,
@@ -146,9 +167,9 @@ async def finish_conversation(
     success = await conversation_service.finish_conversation(conversation_id, request.completion_status)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to finish conversation")
-    return {"message": "Conversation finished successfully"}
+    return Response(status_code=204)
 
-@router.post("/{conversation_id}/summary", response_model=SummaryResponse)
+@router.post("/{conversation_id}/summary", responses={200: {"model": SummaryResponse}})
 async def create_conversation_summary(
     conversation_id: str,
     request: CreateSummaryRequest,
@@ -157,69 +178,52 @@ async def create_conversation_summary(
     """Create a summary for a completed conversation"""
     try:
         summary = await conversation_service.create_conversation_summary(
-            conversation_id, request.dict()
+            conversation_id, request.model_dump(exclude_unset=True)
         )
-        return SummaryResponse(**summary.to_dict())
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return ORJSONResponse(summary.to_dict())
+    except ServiceException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from None
 
-@router.get("/{conversation_id}/summary", response_model=SummaryResponse)
+@router.get("/{conversation_id}/summary", responses={200: {"model": SummaryResponse}})
 async def get_conversation_summary(
     conversation_id: str,
+    request: Request,
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get conversation summary by conversation ID"""
     summary = await conversation_service.get_conversation_summary(conversation_id)
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
-    return SummaryResponse(**summary.to_dict())
+    # to_dict is already the SummaryResponse shape and JSON-safe, so it is sent as is
+    return etag_response(request, orjson.dumps(summary.to_dict()), IMMUTABLE_CACHE_CONTROL)
 
-@router.get("/user/{user_email}", response_model=List[ConversationResponse])
+@router.get("/user/{user_email}", responses={200: {"model": List[ConversationResponse]}})
 async def get_user_conversations(
-    user_email: str,
+    user_email: str = Depends(valid_user_email),
     limit: Optional[int] = Query(None, ge=1, le=100),
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get all conversations for a user"""
     conversations = await conversation_service.get_user_conversations(user_email, limit)
     
-    response_conversations = []
-    for conversation in conversations:
-        messages = [
-            MessageResponse(
-                speaker=msg.speaker,
-                content=msg.content,
-                message_type=msg.message_type,
-                timestamp=msg.timestamp
-            )
-            for msg in conversation.messages
-        ]
-        
-        response_conversations.append(ConversationResponse(
-            conversation_id=conversation.conversation_id,
-            user_email=conversation.user_email,
-            season=conversation.season,
-            episode=conversation.episode,
-            status=conversation.status,
-            start_time=conversation.start_time,
-            end_time=conversation.end_time,
-            duration_seconds=conversation.duration_seconds,
-            messages=messages
-        ))
+    response_conversations = [_conversation_response(conversation) for conversation in conversations]
     
-    return response_conversations
+    # Returned directly so the list skips jsonable_encoder; `responses` documents the schema
+    return Response(_CONVERSATION_LIST.dump_json(response_conversations), media_type="application/json")
 
-@router.get("/user/{user_email}/summaries", response_model=List[SummaryResponse])
+@router.get("/user/{user_email}/summaries", responses={200: {"model": List[SummaryResponse]}})
 async def get_user_summaries(
-    user_email: str,
+    request: Request,
+    user_email: str = Depends(valid_user_email),
     limit: Optional[int] = Query(None, ge=1, le=100),
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get all conversation summaries for a user"""
     summaries = await conversation_service.get_user_summaries(user_email, limit)
-    return [SummaryResponse(**summary.to_dict()) for summary in summaries]
+    # New summaries can be added, so the list is revalidated rather than reused
+    return etag_response(request, orjson.dumps([summary.to_dict() for summary in summaries]), REVALIDATE_CACHE_CONTROL)
 
-@router.get("/episode/season/{season}/episode/{episode}", response_model=List[ConversationResponse])
+@router.get("/episode/season/{season}/episode/{episode}", responses={200: {"model": List[ConversationResponse]}})
 async def get_episode_conversations(
     season: int,
     episode: int,
@@ -228,31 +232,9 @@ async def get_episode_conversations(
     """Get all conversations for a specific episode"""
     conversations = await conversation_service.get_episode_conversations(season, episode)
     
-    response_conversations = []
-    for conversation in conversations:
-        messages = [
-            MessageResponse(
-                speaker=msg.speaker,
-                content=msg.content,
-                message_type=msg.message_type,
-                timestamp=msg.timestamp
-            )
-            for msg in conversation.messages
-        ]
-        
-        response_conversations.append(ConversationResponse(
-            conversation_id=conversation.conversation_id,
-            user_email=conversation.user_email,
-            season=conversation.season,
-            episode=conversation.episode,
-            status=conversation.status,
-            start_time=conversation.start_time,
-            end_time=conversation.end_time,
-            duration_seconds=conversation.duration_seconds,
-            messages=messages
-        ))
+    response_conversations = [_conversation_response(conversation) for conversation in conversations]
     
-    return response_conversations
+    return Response(_CONVERSATION_LIST.dump_json(response_conversations), media_type="application/json")
 
 @router.get("/{conversation_id}/analytics")
 async def get_conversation_analytics(
@@ -267,7 +249,7 @@ async def get_conversation_analytics(
 
 @router.get("/user/{user_email}/progression")
 async def get_user_learning_progression(
-    user_email: str,
+    user_email: str = Depends(valid_user_email),
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get user's learning progression across all conversations"""
@@ -276,42 +258,20 @@ async def get_user_learning_progression(
         raise HTTPException(status_code=404, detail="No learning progression data found")
     return progression
 
-@router.get("/user/{user_email}/search")
+@router.get("/user/{user_email}/search", responses={200: {"model": List[ConversationResponse]}})
 async def search_user_conversations(
-    user_email: str,
+    user_email: str = Depends(valid_user_email),
     q: str = Query(..., min_length=2),
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Search user's conversations by content"""
     conversations = await conversation_service.search_conversations(user_email, q)
     
-    response_conversations = []
-    for conversation in conversations:
-        messages = [
-            MessageResponse(
-                speaker=msg.speaker,
-                content=msg.content,
-                message_type=msg.message_type,
-                timestamp=msg.timestamp
-            )
-            for msg in conversation.messages
-        ]
-        
-        response_conversations.append(ConversationResponse(
-            conversation_id=conversation.conversation_id,
-            user_email=conversation.user_email,
-            season=conversation.season,
-            episode=conversation.episode,
-            status=conversation.status,
-            start_time=conversation.start_time,
-            end_time=conversation.end_time,
-            duration_seconds=conversation.duration_seconds,
-            messages=messages
-        ))
+    response_conversations = [_conversation_response(conversation) for conversation in conversations]
     
-    return response_conversations
+    return Response(_CONVERSATION_LIST.dump_json(response_conversations), media_type="application/json")
 
-@router.delete("/{conversation_id}")
+@router.delete("/{conversation_id}", status_code=204)
 async def delete_conversation(
     conversation_id: str,
     conversation_service: ConversationService = Depends(get_conversation_service)
@@ -320,30 +280,18 @@ async def delete_conversation(
     success = await conversation_service.delete_conversation(conversation_id)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to delete conversation")
-    return {"message": "Conversation deleted successfully"}
+    return Response(status_code=204)
 
 @router.get("/user/{user_email}/summary")
 async def get_user_conversation_summary(
-    user_email: str,
+    user_email: str = Depends(valid_user_email),
     conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get user conversation summary with key metrics"""
-    progression = await conversation_service.get_user_learning_progression(user_email)
-    if not progression:
+    summary = await conversation_service.get_user_conversation_summary(user_email)
+    if not summary:
         raise HTTPException(status_code=404, detail="No conversation data found")
-    
-    return {
-        "user_email": user_email,
-        "total_conversations": progression["learning_stats"]["total_sessions"],
-        "completed_conversations": progression["learning_stats"]["completed_sessions"],
-        "total_words_learned": progression["learning_stats"]["total_words_learned"],
-        "total_topics_covered": progression["learning_stats"]["total_topics_covered"],
-        "total_learning_hours": progression["performance"]["total_learning_time_hours"],
-        "average_session_minutes": progression["performance"]["average_session_time_minutes"],
-        "average_performance": progression["performance"]["average_rating"],
-        "last_session": progression["recent_activity"]["last_session"],
-        "recent_conversations": progression["recent_activity"]["recent_conversations"]
-    }
+    return summary
 
 @router.get("/stats/overview")
 async def get_conversations_overview(
@@ -3,21 +3,35 @@ Enhanced User API endpoints for comprehensive user management
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter
 from datetime import datetime
 
 from services.enhanced_user_service import EnhancedUserService
 from services.firebase_service import get_firebase_service
 from models.enhanced_user import EnhancedUser, UserStatus
+from utils.exceptions import ServiceException
+from utils.validators import EmailValidator
 
 # Initialize router
-router = APIRouter(prefix="/users", tags=["Enhanced Users"])
+router = APIRouter(prefix="/users", tags=["Enhanced Users"], default_response_class=ORJSONResponse)
+
+# Dependency to get services; the service is stateless, so one instance serves every request
+_user_service: Optional[EnhancedUserService] = None
 
-# Dependency to get services
 def get_user_service():
-    firebase_service = get_firebase_service()
-    return EnhancedUserService(firebase_service)
+    global _user_service
+    if _user_service is None:
+        _user_service = EnhancedUserService(get_firebase_service())
+    return _user_service
+
+def valid_email(email: str) -> str:
+    """Path parameter dependency that validates and normalizes the email"""
+    normalized = EmailValidator.normalize_email(email)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail="Invalid email address")
+    return normalized
 
 # Request/Response Models
 class CreateUserRequest(BaseModel):
@@ -51,6 +65,9 @@ class UserResponse(BaseModel):
     topics_learnt: List[str]
     total_time: float
 
+# Compiled once; list endpoints serialize straight to JSON bytes through it
+_USER_LIST = TypeAdapter(List[UserResponse])
+
 @router.post("/create", response_model=UserResponse)
 async def create_user(
     request: CreateUserRequest,
@@ -58,14 +75,14 @@ async def create_user(
 ):
     """Create a new enhanced user"""
     try:
-        user = await user_service.create_user(request.dict())
+        user = await user_service.create_user(request.model_dump(exclude_unset=True))
         return UserResponse(**user.to_dict())
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except ServiceException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from None
 
 @router.get("/{email}", response_model=UserResponse)
 async def get_user(
-    email: str,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Get user by email"""
@@ -85,10 +102,10 @@ async def get_user_by_device(
         raise HTTPException(status_code=404, detail="User not found")
     return UserResponse(**user.to_dict())
 
-@router.put("/{email}/progress")
+@router.put("/{email}/progress", status_code=204)
 async def update_user_progress(
-    email: str,
     request: UpdateProgressRequest,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Update user's learning progress"""
@@ -97,12 +114,12 @@ async def update_user_progress(
     )
     if not success:
         raise HTTPException(status_code=400, detail="Failed to update progress")
-    return {"message": "Progress updated successfully"}
+    return Response(status_code=204)
 
-@router.put("/{email}/learning-data")
+@router.put("/{email}/learning-data", status_code=204)
 async def add_learning_data(
-    email: str,
     request: AddLearningDataRequest,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Add learning data for a user"""
@@ -111,28 +128,36 @@ async def add_learning_data(
     )
     if not success:
         raise HTTPException(status_code=400, detail="Failed to add learning data")
-    return {"message": "Learning data added successfully"}
+    return Response(status_code=204)
 
-@router.put("/{email}/last-active")
+@router.put("/{email}/last-active", status_code=204)
 async def update_last_active(
-    email: str,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Update user's last active timestamp"""
     success = await user_service.update_last_active(email)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to update last active")
-    return {"message": "Last active updated successfully"}
+    return Response(status_code=204)
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", responses={200: {"model": List[UserResponse]}})
 async def get_all_users(
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
-    """Get all users"""
-    users = await user_service.get_all_users()
-    return [UserResponse(**user.to_dict()) for user in users]
+    """Get all users, streamed as a JSON array so memory stays flat however many there are"""
+    async def generate():
+        yield b"["
+        separator = b""
+        async for user in user_service.iter_all_users():
+            yield separator + UserResponse(**user.to_dict()).model_dump_json().encode()
+            separator = b","
+        yield b"]"
+    
+    # `responses` documents the schema for the streamed array
+    return StreamingResponse(generate(), media_type="application/json")
 
-@router.get("/status/{status}", response_model=List[UserResponse])
+@router.get("/status/{status}", responses={200: {"model": List[UserResponse]}})
 async def get_users_by_status(
     status: str,
     user_service: EnhancedUserService = Depends(get_user_service)
@@ -144,11 +169,14 @@ async def get_users_by_status(
         raise HTTPException(status_code=400, detail="Invalid status")
     
     users = await user_service.get_users_by_status(user_status)
-    return [UserResponse(**user.to_dict()) for user in users]
+    return Response(
+        _USER_LIST.dump_json([UserResponse(**user.to_dict()) for user in users]),
+        media_type="application/json"
+    )
 
 @router.get("/{email}/analytics")
 async def get_user_analytics(
-    email: str,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Get comprehensive user analytics"""
@@ -157,20 +185,20 @@ async def get_user_analytics(
         raise HTTPException(status_code=404, detail="User not found or no analytics data")
     return analytics
 
-@router.delete("/{email}")
+@router.delete("/{email}", status_code=204)
 async def delete_user(
-    email: str,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Delete a user"""
     success = await user_service.delete_user(email)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to delete user")
-    return {"message": "User deleted successfully"}
+    return Response(status_code=204)
 
 @router.get("/{email}/summary")
 async def get_user_summary(
-    email: str,
+    email: str = Depends(valid_email),
     user_service: EnhancedUserService = Depends(get_user_service)
 ):
     """Get user summary with key metrics"""
@@ -2,22 +2,40 @@
 Episode Prompt API endpoints for learning content management
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import hashlib
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from datetime import datetime
 
 from services.episode_prompt_service import EpisodePromptService
 from services.firebase_service import get_firebase_service
 from models.episode_prompt import EpisodePrompt
+from utils.http_cache import conditional_response, etag_response
 
 # Initialize router
-router = APIRouter(prefix="/episodes", tags=["Episode Prompts"])
+router = APIRouter(prefix="/episodes", tags=["Episode Prompts"], default_response_class=ORJSONResponse)
+
+# Dependency to get services; the service is stateless, so one instance serves every request
+_episode_service: Optional[EpisodePromptService] = None
 
-# Dependency to get services
 def get_episode_service():
-    firebase_service = get_firebase_service()
-    return EpisodePromptService(firebase_service)
+    global _episode_service
+    if _episode_service is None:
+        _episode_service = EpisodePromptService(get_firebase_service())
+    return _episode_service
+
+# Episodes change rarely; clients and proxies may reuse a response briefly and
+# revalidate it cheaply against the ETag afterwards
+EPISODE_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+def _episodes_etag(episodes: List[EpisodePrompt]) -> str:
+    """Weak ETag from each episode's id and last write time, computed without serializing anything"""
+    versions = ",".join(f"S{ep.season}E{ep.episode}@{ep.updated_at or ep.created_at}" for ep in episodes)
+    return f'W/"{hashlib.blake2b(versions.encode(), digest_size=8).hexdigest()}"'
 
 # Request/Response Models
 class CreateEpisodeRequest(BaseModel):
@@ -48,6 +66,9 @@ class RecordUsageRequest(BaseModel):
     completion_rating: int = 5
 
 class EpisodeResponse(BaseModel):
+    # Built straight from EpisodePrompt attributes; stored-only fields are ignored
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
+    
     season: int
     episode: int
     title: str
@@ -64,6 +85,39 @@ class EpisodeResponse(BaseModel):
     average_session_time: float
     average_rating: float
 
+# Built once; validates straight from EpisodePrompt attributes via the model's
+# from_attributes config, so to_dict() is skipped
+_EPISODE_LIST = TypeAdapter(List[EpisodeResponse])
+
+def _episode_response(episode: EpisodePrompt) -> Response:
+    """Serialize one episode with pydantic-core, skipping jsonable_encoder"""
+    body = EpisodeResponse.model_validate(episode).model_dump_json()
+    return Response(body, media_type="application/json")
+
+def _episode_list_response(episodes: List[EpisodePrompt]) -> Response:
+    """Serialize an episode list with pydantic-core in one pass, skipping jsonable_encoder"""
+    body = _EPISODE_LIST.dump_json(_EPISODE_LIST.validate_python(episodes))
+    return Response(body, media_type="application/json")
+
+# Episodes serialized per chunk of a streamed list
+EPISODE_STREAM_CHUNK_SIZE = 100
+
+def _episode_list_stream(episodes: List[EpisodePrompt]) -> StreamingResponse:
+    """Stream an episode list as a JSON array, serializing a chunk at a time so the
+    first bytes go out early and no single dump holds the event loop"""
+    async def generate():
+        yield b"["
+        separator = b""
+        for start in range(0, len(episodes), EPISODE_STREAM_CHUNK_SIZE):
+            chunk = episodes[start:start + EPISODE_STREAM_CHUNK_SIZE]
+            body = _EPISODE_LIST.dump_json(_EPISODE_LIST.validate_python(chunk))
+            # Drop the chunk's own brackets so the chunks join into one array
+            yield separator + body[1:-1]
+            separator = b","
+        yield b"]"
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
 @router.post("/create", response_model=EpisodeResponse)
 async def create_episode_prompt(
     request: CreateEpisodeRequest,
@@ -71,8 +125,8 @@ async def create_episode_prompt(
 ):
     """Create a new episode prompt"""
     try:
-        episode = await episode_service.create_episode_prompt(request.dict())
-        return EpisodeResponse(**episode.to_dict())
+        episode = await episode_service.create_episode_prompt(request.model_dump(exclude_unset=True))
+        return _episode_response(episode)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -80,40 +134,48 @@ async def create_episode_prompt(
 async def get_episode_prompt(
     season: int,
     episode: int,
+    request: Request,
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get episode prompt by season and episode"""
     episode_prompt = await episode_service.get_episode_prompt(season, episode)
     if not episode_prompt:
         raise HTTPException(status_code=404, detail="Episode not found")
-    return EpisodeResponse(**episode_prompt.to_dict())
+    return conditional_response(
+        request, _episodes_etag([episode_prompt]), EPISODE_CACHE_CONTROL,
+        lambda: _episode_response(episode_prompt)
+    )
 
-@router.get("/season/{season}", response_model=List[EpisodeResponse])
+@router.get("/season/{season}", responses={200: {"model": List[EpisodeResponse]}})
 async def get_season_episodes(
     season: int,
+    request: Request,
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get all episodes for a specific season"""
     episodes = await episode_service.get_season_episodes(season)
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return conditional_response(
+        request, _episodes_etag(episodes), EPISODE_CACHE_CONTROL,
+        lambda: _episode_list_stream(episodes)
+    )
 
-@router.get("/difficulty/{difficulty_level}", response_model=List[EpisodeResponse])
+@router.get("/difficulty/{difficulty_level}", responses={200: {"model": List[EpisodeResponse]}})
 async def get_episodes_by_difficulty(
     difficulty_level: str,
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get episodes by difficulty level"""
     episodes = await episode_service.get_episodes_by_difficulty(difficulty_level)
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return _episode_list_response(episodes)
 
-@router.get("/age-group/{age_group}", response_model=List[EpisodeResponse])
+@router.get("/age-group/{age_group}", responses={200: {"model": List[EpisodeResponse]}})
 async def get_episodes_by_age_group(
     age_group: str,
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get episodes by age group"""
     episodes = await episode_service.get_episodes_by_age_group(age_group)
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return _episode_list_response(episodes)
 
 @router.put("/season/{season}/episode/{episode}")
 async def update_episode_prompt(
@@ -123,8 +185,8 @@ async def update_episode_prompt(
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Update episode prompt"""
-    # Filter out None values
-    updates = {k: v for k, v in request.dict().items() if v is not None}
+    # Only the fields the client actually set
+    updates = request.model_dump(exclude_none=True)
     
     if not updates:
         raise HTTPException(status_code=400, detail="No updates provided")
@@ -142,7 +204,7 @@ async def record_episode_usage(
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Record usage of an episode prompt"""
-    success = await episode_service.record_usage(season, episode, request.user_email, request.dict())
+    success = await episode_service.record_usage(season, episode, request.user_email, request.model_dump(exclude_unset=True))
     if not success:
         raise HTTPException(status_code=400, detail="Failed to record usage")
     return {"message": "Usage recorded successfully"}
@@ -159,33 +221,33 @@ async def get_episode_analytics(
         raise HTTPException(status_code=404, detail="Episode not found or no analytics data")
     return analytics
 
-@router.get("/", response_model=List[EpisodeResponse])
+@router.get("/", responses={200: {"model": List[EpisodeResponse]}})
 async def get_all_episodes(
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get all episode prompts"""
     episodes = await episode_service.get_all_episodes()
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return _episode_list_stream(episodes)
 
-@router.get("/popular", response_model=List[EpisodeResponse])
+@router.get("/popular", responses={200: {"model": List[EpisodeResponse]}})
 async def get_popular_episodes(
     limit: int = Query(10, ge=1, le=50),
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get most popular episodes by usage"""
     episodes = await episode_service.get_popular_episodes(limit)
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return _episode_list_response(episodes)
 
-@router.get("/search", response_model=List[EpisodeResponse])
+@router.get("/search", responses={200: {"model": List[EpisodeResponse]}})
 async def search_episodes(
     q: str = Query(..., min_length=2),
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Search episodes by title, words, or topics"""
     episodes = await episode_service.search_episodes(q)
-    return [EpisodeResponse(**episode.to_dict()) for episode in episodes]
+    return _episode_list_response(episodes)
 
-@router.delete("/season/{season}/episode/{episode}")
+@router.delete("/season/{season}/episode/{episode}", status_code=204)
 async def delete_episode_prompt(
     season: int,
     episode: int,
@@ -195,83 +257,24 @@ async def delete_episode_prompt(
     success = await episode_service.delete_episode_prompt(season, episode)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to delete episode")
-    return {"message": "Episode deleted successfully"}
+    return Response(status_code=204)
 
 @router.get("/season/{season}/episode/{episode}/summary")
 async def get_episode_summary(
     season: int,
     episode: int,
+    request: Request,
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get episode summary with key metrics"""
-    episode_prompt = await episode_service.get_episode_prompt(season, episode)
-    if not episode_prompt:
+    summary = await episode_service.get_episode_summary(season, episode)
+    if not summary:
         raise HTTPException(status_code=404, detail="Episode not found")
-    
-    return {
-        "episode_id": f"S{season}E{episode}",
-        "title": episode_prompt.title,
-        "difficulty_level": episode_prompt.difficulty_level,
-        "age_group": episode_prompt.age_group,
-        "words_count": len(episode_prompt.words_to_teach),
-        "topics_count": len(episode_prompt.topics_to_cover),
-        "objectives_count": len(episode_prompt.learning_objectives),
-        "total_uses": episode_prompt.total_uses,
-        "unique_users": len(episode_prompt.users_completed),
-        "average_session_time_minutes": round(episode_prompt.average_session_time / 60, 2),
-        "average_rating": round(episode_prompt.average_rating, 2),
-        "words_taught_count": len(episode_prompt.words_taught),
-        "topics_taught_count": len(episode_prompt.topics_taught),
-        "created_at": episode_prompt.created_at,
-        "last_used": episode_prompt.last_used
-    }
+    return etag_response(request, orjson.dumps(summary), EPISODE_CACHE_CONTROL)
 
 @router.get("/stats/overview")
 async def get_episodes_overview(
     episode_service: EpisodePromptService = Depends(get_episode_service)
 ):
     """Get overview statistics for all episodes"""
-    episodes = await episode_service.get_all_episodes()
-    
-    if not episodes:
-        return {
-            "total_episodes": 0,
-            "total_seasons": 0,
-            "total_uses": 0,
-            "total_unique_users": 0
-        }
-    
-    total_episodes = len(episodes)
-    total_seasons = len(set(ep.season for ep in episodes))
-    total_uses = sum(ep.total_uses for ep in episodes)
-    
-    # Count unique users across all episodes
-    all_users = set()
-    for episode in episodes:
-        all_users.update(episode.users_completed)
-    
-    difficulty_stats = {}
-    age_group_stats = {}
-    
-    for episode in episodes:
-        # Count by difficulty
-        diff = episode.difficulty_level
-        if diff not in difficulty_stats:
-            difficulty_stats[diff] = 0
-        difficulty_stats[diff] += 1
-        
-        # Count by age group
-        age = episode.age_group
-        if age not in age_group_stats:
-            age_group_stats[age] = 0
-        age_group_stats[age] += 1
-    
-    return {
-        "total_episodes": total_episodes,
-        "total_seasons": total_seasons,
-        "total_uses": total_uses,
-        "total_unique_users": len(all_users),
-        "difficulty_distribution": difficulty_stats,
-        "age_group_distribution": age_group_stats,
-        "average_uses_per_episode": round(total_uses / total_episodes, 2) if total_episodes > 0 else 0
-    }
+    return await episode_service.get_episodes_overview()
@@ -4,72 +4,173 @@ Comprehensive API Test Suite for Enhanced Pipecat Server
 Tests all endpoints: Enhanced Users, Episodes, Conversations
 """
 
-import json
-import requests
-import time
+import asyncio
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import sys
 from datetime import datetime
+from typing import Dict, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    # json.loads takes bytes too
+    import json as orjson
 
 BASE_URL = "http://localhost:7860"
 
+# Pooled client shared by every test; opened and closed in run_suite()
+client: Optional[httpx.AsyncClient] = None
+
+# Keep in-flight requests well under the server's per-window rate limit
+# (RATE_LIMIT_REQUESTS in config/settings.py) so batches don't trip 429s
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
+MAX_IN_FLIGHT = max(8, int(RATE_LIMIT_REQUESTS * 0.5))
+request_slots: Optional[asyncio.Semaphore] = None
+
+# Report lines are queued and written to stdout by a listener thread, so the
+# event loop never blocks on the terminal; started and stopped in main()
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log = logging.getLogger("comprehensive_test")
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(logging.INFO)
+log.propagate = False
+
+def _report_listener() -> logging.handlers.QueueListener:
+    """Build the listener that writes queued report lines to stdout as-is"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return logging.handlers.QueueListener(_log_queue, handler)
+
+# Output buffer of the test group running in the current task, if any
+_output: contextvars.ContextVar = contextvars.ContextVar("_output", default=None)
+
+def emit(line=""):
+    """Report a line, or hold it in the current test group's buffer"""
+    buffer = _output.get()
+    if buffer is None:
+        log.info("%s", line)
+    else:
+        buffer.append(line)
+
+async def run_buffered(group):
+    """Run a test group, printing its output as one block when it finishes so
+    concurrently running groups don't interleave"""
+    buffer = []
+    _output.set(buffer)
+    try:
+        return await group
+    finally:
+        log.info("%s", "\n".join(buffer))
+
+async def _collect(test):
+    """Run one test with its own output buffer, returning (result, lines)"""
+    buffer = []
+    _output.set(buffer)
+    return await test, buffer
+
+async def gather_tests(tests):
+    """Run independent (name, request) tests concurrently, emitting their
+    output in the order given"""
+    outcomes = await asyncio.gather(*(_collect(test) for _, test in tests))
+    results = []
+    for (name, _), (result, lines) in zip(tests, outcomes):
+        print_test(name)
+        for line in lines:
+            emit(line)
+        results.append(result)
+    return results
+
 def print_section(title):
     """Print a formatted section header"""
-    print(f"\n{'='*60}")
-    print(f"🧪 {title}")
-    print(f"{'='*60}")
+    emit(f"\n{'='*60}")
+    emit(f"🧪 {title}")
+    emit(f"{'='*60}")
 
 def print_test(test_name):
     """Print test name"""
-    print(f"\n▶️  {test_name}")
+    emit(f"\n▶️  {test_name}")
+
+# In-flight and completed GETs keyed by endpoint, so repeated and concurrent
+# reads share one request; any write clears it
+_get_responses: Dict[str, asyncio.Task] = {}
+
+async def _send(method, endpoint, data=None):
+    """Send one request within the concurrency bound, retrying once on 429"""
+    async with request_slots:
+        response = await client.request(method, endpoint, json=data)
+        if response.status_code == 429:
+            # Rate limited: back off as the server asks and retry once
+            await asyncio.sleep(float(response.headers.get("Retry-After", "0.5")))
+            response = await client.request(method, endpoint, json=data)
+        return response
+
+def _get(endpoint):
+    """Share the GET for this endpoint, dropping it again if it failed"""
+    task = _get_responses.get(endpoint)
+    if task is None:
+        task = _get_responses[endpoint] = asyncio.create_task(_send("GET", endpoint))
+        
+        def forget_failure(done):
+            if (done.cancelled() or done.exception()) and _get_responses.get(endpoint) is done:
+                del _get_responses[endpoint]
+        
+        task.add_done_callback(forget_failure)
+    return task
 
-def test_request(method, endpoint, data=None, expected_status=200):
+async def test_request(method, endpoint, data=None, expected_status=200):
     """Helper function to test API requests"""
-    url = f"{BASE_URL}{endpoint}"
     try:
-        if method.upper() == "GET":
-            response = requests.get(url)
-        elif method.upper() == "POST":
-            response = requests.post(url, json=data)
-        elif method.upper() == "PUT":
-            response = requests.put(url, json=data)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url)
+        method = method.upper()
+        if method == "GET":
+            response = await asyncio.shield(_get(endpoint))
+        else:
+            # Writes can change what any resource reads back (e.g. usage feeds user analytics)
+            _get_responses.clear()
+            response = await _send(method, endpoint, data)
         
         if response.status_code == expected_status:
-            print(f"   ✅ {method} {endpoint} - Status: {response.status_code}")
+            emit(f"   ✅ {method} {endpoint} - Status: {response.status_code}")
             if response.headers.get('content-type', '').startswith('application/json'):
                 try:
-                    return response.json()
+                    # Parse the raw bytes, skipping httpx's text decode
+                    return orjson.loads(response.content)
                 except:
                     return {"raw_response": response.text}
             return {"status": "success"}
         else:
-            print(f"   ❌ {method} {endpoint} - Expected: {expected_status}, Got: {response.status_code}")
-            print(f"      Response: {response.text[:200]}...")
+            emit(f"   ❌ {method} {endpoint} - Expected: {expected_status}, Got: {response.status_code}")
+            emit(f"      Response: {response.text[:200]}...")
             return None
     except Exception as e:
-        print(f"   ❌ {method} {endpoint} - Error: {str(e)}")
+        emit(f"   ❌ {method} {endpoint} - Error: {str(e)}")
         return None
 
-def test_basic_endpoints():
+async def test_basic_endpoints():
     """Test basic server endpoints"""
     print_section("BASIC SERVER ENDPOINTS")
     
     print_test("Root Endpoint")
-    root_data = test_request("GET", "/")
+    root_data = await test_request("GET", "/")
     if root_data:
-        print(f"      Server: {root_data.get('message', 'Unknown')}")
-        print(f"      Features: {len(root_data.get('features', []))}")
+        emit(f"      Server: {root_data.get('message', 'Unknown')}")
+        emit(f"      Features: {len(root_data.get('features', []))}")
     
     print_test("Health Check")
-    health_data = test_request("GET", "/health")
+    health_data = await test_request("GET", "/health")
     if health_data:
-        print(f"      Status: {health_data.get('status', 'Unknown')}")
-        print(f"      ESP32 Mode: {health_data.get('esp32_mode', False)}")
+        emit(f"      Status: {health_data.get('status', 'Unknown')}")
+        emit(f"      ESP32 Mode: {health_data.get('esp32_mode', False)}")
     
     print_test("API Documentation")
-    test_request("GET", "/docs")
+    await test_request("GET", "/docs")
 
-def test_enhanced_users_api():
+async def test_enhanced_users_api():
     """Test Enhanced Users API endpoints"""
     print_section("ENHANCED USERS API")
     
@@ -87,22 +188,22 @@ def test_enhanced_users_api():
     }
     
     print_test("Create User")
-    created_user = test_request("POST", "/users/create", user_data, 200)
+    created_user = await test_request("POST", "/users/create", user_data, 200)
     
     print_test("Get All Users")
-    all_users = test_request("GET", "/users/")
+    all_users = await test_request("GET", "/users/")
     if all_users:
-        print(f"      Total users: {len(all_users)}")
+        emit(f"      Total users: {len(all_users)}")
     
     print_test("Get User by Email")
-    user_by_email = test_request("GET", f"/users/{user_data['email']}")
+    user_by_email = await test_request("GET", f"/users/{user_data['email']}")
     
     print_test("Get User by Device ID")
-    user_by_device = test_request("GET", f"/users/device/{user_data['device_id']}")
+    user_by_device = await test_request("GET", f"/users/device/{user_data['device_id']}")
     
     print_test("Update User Progress")
     progress_data = {"season": 1, "episode": 2, "completed": True}
-    test_request("PUT", f"/users/{user_data['email']}/progress", progress_data)
+    await test_request("PUT", f"/users/{user_data['email']}/progress", progress_data, expected_status=204)
     
     print_test("Add Learning Data")
     learning_data = {
@@ -110,24 +211,24 @@ def test_enhanced_users_api():
         "topics": ["greetings", "vocabulary"],
         "session_time": 300.5
     }
-    test_request("PUT", f"/users/{user_data['email']}/learning-data", learning_data)
+    await test_request("PUT", f"/users/{user_data['email']}/learning-data", learning_data, expected_status=204)
     
     print_test("Update Last Active")
-    test_request("PUT", f"/users/{user_data['email']}/last-active")
+    await test_request("PUT", f"/users/{user_data['email']}/last-active", expected_status=204)
     
     print_test("Get User Analytics")
-    analytics = test_request("GET", f"/users/{user_data['email']}/analytics")
+    analytics = await test_request("GET", f"/users/{user_data['email']}/analytics")
     if analytics:
-        print(f"      Learning stats available: {bool(analytics.get('learning_stats'))}")
+        emit(f"      Learning stats available: {bool(analytics.get('learning_stats'))}")
     
     print_test("Get User Summary")
-    summary = test_request("GET", f"/users/{user_data['email']}/summary")
+    summary = await test_request("GET", f"/users/{user_data['email']}/summary")
     if summary:
-        print(f"      Name: {summary.get('name')}, Progress: {summary.get('current_progress')}")
+        emit(f"      Name: {summary.get('name')}, Progress: {summary.get('current_progress')}")
     
     return user_data['email']  # Return email for other tests
 
-def test_episodes_api():
+async def test_episodes_api():
     """Test Episodes API endpoints"""
     print_section("EPISODES API")
     
@@ -145,30 +246,33 @@ def test_episodes_api():
     }
     
     print_test("Create Episode")
-    created_episode = test_request("POST", "/episodes/create", episode_data, 200)
-    
-    print_test("Get All Episodes")
-    all_episodes = test_request("GET", "/episodes/")
+    created_episode = await test_request("POST", "/episodes/create", episode_data, 200)
+    
+    # The reads don't depend on each other, so they go out as one batch
+    season, episode = episode_data['season'], episode_data['episode']
+    (all_episodes, specific_episode, season_episodes, difficulty_episodes,
+     age_episodes, popular, search_results, overview) = await gather_tests([
+        ("Get All Episodes", test_request("GET", "/episodes/")),
+        ("Get Specific Episode", test_request("GET", f"/episodes/season/{season}/episode/{episode}")),
+        ("Get Season Episodes", test_request("GET", f"/episodes/season/{season}")),
+        ("Get Episodes by Difficulty", test_request("GET", f"/episodes/difficulty/{episode_data['difficulty_level']}")),
+        ("Get Episodes by Age Group", test_request("GET", f"/episodes/age-group/{episode_data['age_group']}")),
+        ("Get Popular Episodes", test_request("GET", "/episodes/popular?limit=5")),
+        ("Search Episodes", test_request("GET", "/episodes/search?q=learning")),
+        ("Get Episodes Overview", test_request("GET", "/episodes/stats/overview")),
+    ])
     if all_episodes:
-        print(f"      Total episodes: {len(all_episodes)}")
-    
-    print_test("Get Specific Episode")
-    specific_episode = test_request("GET", f"/episodes/season/{episode_data['season']}/episode/{episode_data['episode']}")
-    
-    print_test("Get Season Episodes")
-    season_episodes = test_request("GET", f"/episodes/season/{episode_data['season']}")
+        emit(f"      Total episodes: {len(all_episodes)}")
     if season_episodes:
-        print(f"      Episodes in season {episode_data['season']}: {len(season_episodes)}")
-    
-    print_test("Get Episodes by Difficulty")
-    difficulty_episodes = test_request("GET", f"/episodes/difficulty/{episode_data['difficulty_level']}")
-    
-    print_test("Get Episodes by Age Group")
-    age_episodes = test_request("GET", f"/episodes/age-group/{episode_data['age_group']}")
+        emit(f"      Episodes in season {season}: {len(season_episodes)}")
+    if search_results:
+        emit(f"      Search results: {len(search_results)}")
+    if overview:
+        emit(f"      Total episodes (overview): {overview.get('total_episodes', 0)}")
     
     print_test("Update Episode")
     update_data = {"title": "Updated Introduction to Learning"}
-    test_request("PUT", f"/episodes/season/{episode_data['season']}/episode/{episode_data['episode']}", update_data)
+    await test_request("PUT", f"/episodes/season/{season}/episode/{episode}", update_data)
     
     print_test("Record Episode Usage")
     usage_data = {
@@ -178,34 +282,21 @@ def test_episodes_api():
         "session_time": 180.0,
         "completion_rating": 5
     }
-    test_request("POST", f"/episodes/season/{episode_data['season']}/episode/{episode_data['episode']}/usage", usage_data)
+    await test_request("POST", f"/episodes/season/{season}/episode/{episode}/usage", usage_data)
     
-    print_test("Get Episode Analytics")
-    episode_analytics = test_request("GET", f"/episodes/season/{episode_data['season']}/episode/{episode_data['episode']}/analytics")
+    # Analytics and summary read the usage just recorded
+    episode_analytics, episode_summary = await gather_tests([
+        ("Get Episode Analytics", test_request("GET", f"/episodes/season/{season}/episode/{episode}/analytics")),
+        ("Get Episode Summary", test_request("GET", f"/episodes/season/{season}/episode/{episode}/summary")),
+    ])
     if episode_analytics:
-        print(f"      Usage stats available: {bool(episode_analytics.get('usage_stats'))}")
-    
-    print_test("Get Episode Summary")
-    episode_summary = test_request("GET", f"/episodes/season/{episode_data['season']}/episode/{episode_data['episode']}/summary")
+        emit(f"      Usage stats available: {bool(episode_analytics.get('usage_stats'))}")
     if episode_summary:
-        print(f"      Title: {episode_summary.get('title')}, Uses: {episode_summary.get('total_uses', 0)}")
-    
-    print_test("Get Popular Episodes")
-    popular = test_request("GET", "/episodes/popular?limit=5")
-    
-    print_test("Search Episodes")
-    search_results = test_request("GET", "/episodes/search?q=learning")
-    if search_results:
-        print(f"      Search results: {len(search_results)}")
-    
-    print_test("Get Episodes Overview")
-    overview = test_request("GET", "/episodes/stats/overview")
-    if overview:
-        print(f"      Total episodes: {overview.get('total_episodes', 0)}")
+        emit(f"      Title: {episode_summary.get('title')}, Uses: {episode_summary.get('total_uses', 0)}")
     
     return episode_data['season'], episode_data['episode']
 
-def test_conversations_api(user_email):
+async def test_conversations_api(user_email):
     """Test Conversations API endpoints"""
     print_section("CONVERSATIONS API")
     
@@ -215,14 +306,14 @@ def test_conversations_api(user_email):
         "season": 1,
         "episode": 1
     }
-    start_response = test_request("POST", "/conversations/start", conversation_data)
+    start_response = await test_request("POST", "/conversations/start", conversation_data)
     
     if not start_response:
-        print("      ❌ Cannot test conversations without starting one")
+        emit("      ❌ Cannot test conversations without starting one")
         return
     
     conversation_id = start_response.get('conversation_id')
-    print(f"      Conversation ID: {conversation_id}")
+    emit(f"      Conversation ID: {conversation_id}")
     
     print_test("Add Messages")
     messages = [
@@ -232,17 +323,17 @@ def test_conversations_api(user_email):
     ]
     
     for msg in messages:
-        test_request("POST", f"/conversations/{conversation_id}/messages", msg)
+        await test_request("POST", f"/conversations/{conversation_id}/messages", msg, expected_status=204)
     
     print_test("Get Conversation")
-    conversation = test_request("GET", f"/conversations/{conversation_id}")
+    conversation = await test_request("GET", f"/conversations/{conversation_id}")
     if conversation:
-        print(f"      Messages: {len(conversation.get('messages', []))}")
-        print(f"      Status: {conversation.get('status')}")
+        emit(f"      Messages: {len(conversation.get('messages', []))}")
+        emit(f"      Status: {conversation.get('status')}")
     
     print_test("Finish Conversation")
     finish_data = {"completion_status": "completed"}
-    test_request("PUT", f"/conversations/{conversation_id}/finish", finish_data)
+    await test_request("PUT", f"/conversations/{conversation_id}/finish", finish_data, expected_status=204)
     
     print_test("Create Conversation Summary")
     summary_data = {
@@ -255,101 +346,120 @@ def test_conversations_api(user_email):
         "areas_for_improvement": ["Pronunciation"],
         "next_recommendations": ["Continue with more vocabulary", "Practice pronunciation"]
     }
-    summary_response = test_request("POST", f"/conversations/{conversation_id}/summary", summary_data)
+    summary_response = await test_request("POST", f"/conversations/{conversation_id}/summary", summary_data)
     
     print_test("Get Conversation Summary")
-    summary = test_request("GET", f"/conversations/{conversation_id}/summary")
+    summary = await test_request("GET", f"/conversations/{conversation_id}/summary")
     if summary:
-        print(f"      Performance: {summary.get('performance_rating', 'N/A')}/5")
-        print(f"      Words learned: {len(summary.get('words_learned', []))}")
+        emit(f"      Performance: {summary.get('performance_rating', 'N/A')}/5")
+        emit(f"      Words learned: {len(summary.get('words_learned', []))}")
     
     print_test("Get User Conversations")
-    user_conversations = test_request("GET", f"/conversations/user/{user_email}")
+    user_conversations = await test_request("GET", f"/conversations/user/{user_email}")
     if user_conversations:
-        print(f"      User conversations: {len(user_conversations)}")
+        emit(f"      User conversations: {len(user_conversations)}")
     
     print_test("Get User Summaries")
-    user_summaries = test_request("GET", f"/conversations/user/{user_email}/summaries")
+    user_summaries = await test_request("GET", f"/conversations/user/{user_email}/summaries")
     if user_summaries:
-        print(f"      User summaries: {len(user_summaries)}")
+        emit(f"      User summaries: {len(user_summaries)}")
     
     print_test("Get Episode Conversations")
-    episode_conversations = test_request("GET", f"/conversations/episode/season/1/episode/1")
+    episode_conversations = await test_request("GET", f"/conversations/episode/season/1/episode/1")
     
     print_test("Get Conversation Analytics")
-    analytics = test_request("GET", f"/conversations/{conversation_id}/analytics")
+    analytics = await test_request("GET", f"/conversations/{conversation_id}/analytics")
     if analytics:
-        print(f"      Analytics available: {bool(analytics.get('conversation_info'))}")
+        emit(f"      Analytics available: {bool(analytics.get('conversation_info'))}")
     
     print_test("Get User Learning Progression")
-    progression = test_request("GET", f"/conversations/user/{user_email}/progression")
+    progression = await test_request("GET", f"/conversations/user/{user_email}/progression")
     if progression:
-        print(f"      Total sessions: {progression.get('learning_stats', {}).get('total_sessions', 0)}")
-        print(f"      Words learned: {progression.get('learning_stats', {}).get('total_words_learned', 0)}")
+        emit(f"      Total sessions: {progression.get('learning_stats', {}).get('total_sessions', 0)}")
+        emit(f"      Words learned: {progression.get('learning_stats', {}).get('total_words_learned', 0)}")
     
     print_test("Search User Conversations")
-    search_conversations = test_request("GET", f"/conversations/user/{user_email}/search?q=hello")
+    search_conversations = await test_request("GET", f"/conversations/user/{user_email}/search?q=hello")
     
     print_test("Get User Conversation Summary")
-    user_summary = test_request("GET", f"/conversations/user/{user_email}/summary")
+    user_summary = await test_request("GET", f"/conversations/user/{user_email}/summary")
     if user_summary:
-        print(f"      Total conversations: {user_summary.get('total_conversations', 0)}")
-        print(f"      Learning hours: {user_summary.get('total_learning_hours', 0)}")
+        emit(f"      Total conversations: {user_summary.get('total_conversations', 0)}")
+        emit(f"      Learning hours: {user_summary.get('total_learning_hours', 0)}")
     
     print_test("Get Conversations Overview")
-    overview = test_request("GET", "/conversations/stats/overview")
+    overview = await test_request("GET", "/conversations/stats/overview")
     
     return conversation_id
 
-def test_cleanup(user_email, conversation_id, season, episode):
+async def test_cleanup(user_email, conversation_id, season, episode):
     """Clean up test data"""
     print_section("CLEANUP TEST DATA")
     
     print_test("Delete Conversation")
-    test_request("DELETE", f"/conversations/{conversation_id}")
+    await test_request("DELETE", f"/conversations/{conversation_id}", expected_status=204)
     
     print_test("Delete Episode")
-    test_request("DELETE", f"/episodes/season/{season}/episode/{episode}")
+    await test_request("DELETE", f"/episodes/season/{season}/episode/{episode}", expected_status=204)
     
     print_test("Delete User")
-    test_request("DELETE", f"/users/{user_email}")
+    await test_request("DELETE", f"/users/{user_email}", expected_status=204)
 
-def main():
-    """Run all tests"""
-    print("🚀 COMPREHENSIVE API TEST SUITE")
-    print("Testing Enhanced Pipecat Server with Learning Management System")
-    print(f"Server: {BASE_URL}")
-    print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+async def run_suite():
+    """Run the test groups, concurrently wherever they don't depend on each other"""
+    global client, request_slots
+    request_slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+    client = httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
     
     # Wait for server to be ready
-    print("\n⏳ Waiting for server to be ready...")
-    time.sleep(3)
+    emit("\n⏳ Waiting for server to be ready...")
+    await asyncio.sleep(3)
     
     try:
-        # Test basic endpoints
-        test_basic_endpoints()
-        
-        # Test enhanced users API
-        user_email = test_enhanced_users_api()
+        # Basic endpoints, users and episodes touch separate data
+        _, user_email, (season, episode) = await asyncio.gather(
+            run_buffered(test_basic_endpoints()),
+            run_buffered(test_enhanced_users_api()),
+            run_buffered(test_episodes_api())
+        )
         
-        # Test episodes API
-        season, episode = test_episodes_api()
-        
-        # Test conversations API
-        conversation_id = test_conversations_api(user_email)
+        # Conversations need the user created above
+        conversation_id = await test_conversations_api(user_email)
         
         # Cleanup
         if user_email and conversation_id and season and episode:
-            test_cleanup(user_email, conversation_id, season, episode)
+            await test_cleanup(user_email, conversation_id, season, episode)
+    finally:
+        await client.aclose()
+
+def main():
+    """Run all tests"""
+    listener = _report_listener()
+    listener.start()
+    
+    emit("🚀 COMPREHENSIVE API TEST SUITE")
+    emit("Testing Enhanced Pipecat Server with Learning Management System")
+    emit(f"Server: {BASE_URL}")
+    emit(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    try:
+        asyncio.run(run_suite())
         
         print_section("TEST SUITE COMPLETE")
-        print("✅ All API endpoints tested successfully!")
-        print("🎉 Your Enhanced Pipecat Server with Learning Management System is working perfectly!")
+        emit("✅ All API endpoints tested successfully!")
+        emit("🎉 Your Enhanced Pipecat Server with Learning Management System is working perfectly!")
         
     except KeyboardInterrupt:
-        print("\n⚠️  Tests interrupted by user")
+        emit("\n⚠️  Tests interrupted by user")
     except Exception as e:
-        print(f"\n❌ Test suite failed with error: {e}")
+        emit(f"\n❌ Test suite failed with error: {e}")
+    finally:
+        # Drains the queue before returning
+        listener.stop()
 
 if __name__ == "__main__":
     main()
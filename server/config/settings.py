@@ -48,6 +48,9 @@ class Settings(BaseSettings):
 # Global settings instance
 _settings: Optional[Settings] = None
 
+# Outcome of validate_settings(); settings don't change once loaded, so it runs once
+_settings_valid: Optional[bool] = None
+
 
 def get_settings() -> Settings:
     """Get application settings singleton"""
@@ -59,6 +62,14 @@ def get_settings() -> Settings:
 
 def validate_settings() -> bool:
     """Validate required settings"""
+    global _settings_valid
+    if _settings_valid is None:
+        _settings_valid = _validate_settings()
+    return _settings_valid
+
+
+def _validate_settings() -> bool:
+    """Check the API keys and Firebase credentials, reporting any problems"""
     try:
         settings = get_settings()
         
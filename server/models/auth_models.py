@@ -6,6 +6,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 import hashlib
 import secrets
 import uuid
@@ -27,7 +28,7 @@ class SessionStatus(Enum):
     EXPIRED = "expired"
     REVOKED = "revoked"
 
-@dataclass
+@dataclass(slots=True)
 class ClaimToken:
     """Temporary token for device claiming"""
     token: str
@@ -44,7 +45,7 @@ class ClaimToken:
     def is_valid(self) -> bool:
         return self.status == ClaimTokenStatus.ACTIVE and not self.is_expired()
 
-@dataclass
+@dataclass(slots=True)
 class DeviceRegistration:
     """Device registration in database"""
     device_id: str
@@ -57,12 +58,16 @@ class DeviceRegistration:
     last_seen: Optional[datetime] = None
     device_name: Optional[str] = None
     firmware_version: Optional[str] = None
+    # device_id and mac_address never change, so the hash is computed on first use and kept
+    _hashed_id: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def get_hashed_id(self) -> str:
         """Get hashed device ID for security"""
-        return hashlib.sha256(f"{self.device_id}:{self.mac_address}".encode()).hexdigest()[:16]
+        if self._hashed_id is None:
+            self._hashed_id = hashlib.sha256(f"{self.device_id}:{self.mac_address}".encode()).hexdigest()[:16]
+        return self._hashed_id
 
-@dataclass
+@dataclass(slots=True)
 class DeviceSession:
     """Active device session with JWT"""
     device_id: str
@@ -81,7 +86,7 @@ class DeviceSession:
         """Check if device needs to send heartbeat"""
         return datetime.utcnow() - self.last_heartbeat > timedelta(minutes=heartbeat_interval_minutes)
 
-@dataclass
+@dataclass(slots=True)
 class UserDeviceBinding:
     """User's claimed devices"""
     email: str
@@ -108,6 +113,8 @@ def generate_device_id() -> str:
     """Generate unique device ID"""
     return f"esp32_{uuid.uuid4().hex[:12]}"
 
+@lru_cache(maxsize=4096)
 def hash_device_credentials(device_id: str, mac_address: str) -> str:
     """Create secure hash for device authentication"""
+    # hashlib runs OpenSSL's SHA-256, which uses the CPU's SHA extensions where present
     return hashlib.sha256(f"{device_id}:{mac_address}:device_auth".encode()).hexdigest()
@@ -7,26 +7,49 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 
+import orjson
+
+try:
+    # C parser, several times faster than the stdlib on ISO 8601 strings
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    _parse_datetime = datetime.fromisoformat
+
+def _json_default(value: Any) -> str:
+    """orjson hook for passed-through datetimes; orjson rejects datetime subclasses
+    such as Firestore's DatetimeWithNanoseconds, so every datetime is encoded here"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
 class MessageType(Enum):
     USER = "user"
     AI = "ai"
     SYSTEM = "system"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConversationMessage:
     """Individual message in a conversation"""
     speaker: str  # "user", "bot", "system"
     content: str
     message_type: str = "text"
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Messages are frozen, so the storage dict built on first use always matches the fields
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _storage_dict(self) -> Dict[str, Any]:
+        """Get the shared storage dict; it is only handed out through copies"""
+        if self._dict is None:
+            object.__setattr__(self, "_dict", {
+                "speaker": self.speaker,
+                "content": self.content,
+                "message_type": self.message_type,
+                "timestamp": self.timestamp
+            })
+        return self._dict
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "speaker": self.speaker,
-            "content": self.content,
-            "message_type": self.message_type,
-            "timestamp": self.timestamp
-        }
+        return dict(self._storage_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ConversationMessage":
@@ -34,10 +57,10 @@ class ConversationMessage:
             speaker=data["speaker"],
             content=data["content"],
             message_type=data.get("message_type", "text"),
-            timestamp=data.get("timestamp", datetime.utcnow())
+            timestamp=data["timestamp"] if "timestamp" in data else datetime.utcnow()
         )
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTranscript:
     """Complete conversation transcript"""
     
@@ -57,10 +80,21 @@ class ConversationTranscript:
     end_time: Optional[datetime] = None
     duration_seconds: Optional[float] = None
     status: str = "active"  # "active", "completed", "interrupted"
+    # Shared storage dicts of the messages, kept in step by add_message
+    _message_dicts: Optional[List[Dict[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
     
     def add_message(self, message: ConversationMessage) -> None:
         """Add a message to the conversation"""
         self.messages.append(message)
+        if self._message_dicts is not None:
+            self._message_dicts.append(message._storage_dict())
+    
+    def _stored_message_dicts(self) -> List[Dict[str, Any]]:
+        """Get the messages' shared storage dicts, collected once and extended as messages are added"""
+        # A length mismatch means messages was changed directly rather than through add_message
+        if self._message_dicts is None or len(self._message_dicts) != len(self.messages):
+            self._message_dicts = [msg._storage_dict() for msg in self.messages]
+        return self._message_dicts
     
     def finish_conversation(self, completion_status: str = "completed") -> None:
         """Mark conversation as finished"""
@@ -71,31 +105,45 @@ class ConversationTranscript:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Firebase storage"""
+        # Callers own the result, so each message dict is copied from the shared one
+        return self._as_dict([dict(message) for message in self._stored_message_dicts()])
+    
+    def _as_dict(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the storage dict around the given message dicts"""
         return {
             "conversation_id": self.conversation_id,
             "user_email": self.user_email,
             "season": self.season,
             "episode": self.episode,
-            "messages": [msg.to_dict() for msg in self.messages],
+            "messages": messages,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration_seconds": self.duration_seconds,
             "status": self.status
         }
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes, with message timestamps as ISO strings"""
+        # orjson only reads the shared message dicts, so they needn't be copied
+        return orjson.dumps(
+            self._as_dict(self._stored_message_dicts()),
+            default=_json_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ConversationTranscript":
         """Create from dictionary (Firebase data)"""
         # Parse datetime strings back to datetime objects
         start_time = data.get("start_time")
         if isinstance(start_time, str):
-            start_time = datetime.fromisoformat(start_time)
+            start_time = _parse_datetime(start_time)
         elif start_time is None:
             start_time = datetime.utcnow()
             
         end_time = data.get("end_time")
         if isinstance(end_time, str):
-            end_time = datetime.fromisoformat(end_time)
+            end_time = _parse_datetime(end_time)
             
         return cls(
             conversation_id=data["conversation_id"],
@@ -109,7 +157,7 @@ class ConversationTranscript:
             status=data.get("status", "active")
         )
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSummary:
     """Summary of a user's conversation session"""
     
@@ -149,7 +197,7 @@ class ConversationSummary:
         # Parse datetime string back to datetime object
         created_at = data.get("created_at")
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = _parse_datetime(created_at)
         elif created_at is None:
             created_at = datetime.utcnow()
             
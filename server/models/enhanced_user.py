@@ -56,8 +56,18 @@ class EnhancedUser:
     # Status
     status: UserStatus = UserStatus.ACTIVE
     
+    # Serialized form, reused until update_progress/add_learning_data change the user
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Firebase storage"""
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        # Shallow copy so callers (e.g. in-memory storage) can't alter the cached dict
+        return dict(self._cached_dict)
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Serialize every field, walking the nested parent and progress records"""
         return {
             "device_id": self.device_id,
             "name": self.name,
@@ -114,6 +124,7 @@ class EnhancedUser:
     
     def update_progress(self, season: int, episode: int, completed: bool = False):
         """Update user's learning progress"""
+        self._cached_dict = None
         self.progress.season = season
         self.progress.episode = episode
         if completed:
@@ -123,6 +134,7 @@ class EnhancedUser:
     
     def add_learning_data(self, words: List[str], topics: List[str], session_time: float):
         """Add new learning data from a session"""
+        self._cached_dict = None
         # Add unique words and topics
         for word in words:
             if word not in self.words_learnt:
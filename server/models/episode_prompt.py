@@ -31,7 +31,9 @@ class EpisodePrompt:
     total_uses: int = 0
     users_completed: List[str] = field(default_factory=list)
     total_time_spent: float = 0.0  # Total time across all sessions
-    ratings: List[int] = field(default_factory=list)
+    ratings: List[int] = field(default_factory=list)  # Legacy per-session ratings
+    rating_total: float = 0.0  # Sum of ratings recorded as counters
+    rating_count: int = 0
     
     # Words and topics actually taught (aggregated from usage)
     words_taught: List[str] = field(default_factory=list)
@@ -49,7 +51,8 @@ class EpisodePrompt:
     @property 
     def average_rating(self) -> float:
         """Calculate average rating"""
-        return sum(self.ratings) / len(self.ratings) if self.ratings else 0.0
+        count = len(self.ratings) + self.rating_count
+        return (sum(self.ratings) + self.rating_total) / count if count else 0.0
     
     def record_usage(self, user_email: str, words_learned: List[str], topics_covered: List[str], 
                      session_time: float, rating: int) -> None:
@@ -72,7 +75,8 @@ class EpisodePrompt:
                 self.topics_taught.append(topic)
         
         # Record rating
-        self.ratings.append(rating)
+        self.rating_total += rating
+        self.rating_count += 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Firebase storage"""
@@ -90,6 +94,8 @@ class EpisodePrompt:
             "users_completed": self.users_completed,
             "total_time_spent": self.total_time_spent,
             "ratings": self.ratings,
+            "rating_total": self.rating_total,
+            "rating_count": self.rating_count,
             "words_taught": self.words_taught,
             "topics_taught": self.topics_taught,
             "created_at": self.created_at,
@@ -116,6 +122,8 @@ class EpisodePrompt:
             users_completed=data.get("users_completed", []),
             total_time_spent=data.get("total_time_spent", 0.0),
             ratings=data.get("ratings", []),
+            rating_total=data.get("rating_total", 0.0),
+            rating_count=data.get("rating_count", 0),
             words_taught=data.get("words_taught", []),
             topics_taught=data.get("topics_taught", []),
             created_at=data.get("created_at", datetime.utcnow()),
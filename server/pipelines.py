@@ -0,0 +1,62 @@
+"""
+Shared Pipecat transport configuration used by every bot entrypoint
+"""
+
+import copy
+from typing import Optional
+
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.transports.base_transport import TransportParams
+from pipecat.transports.network.fastapi_websocket import FastAPIWebsocketParams
+from pipecat.transports.services.daily import DailyParams
+
+# Template analyzer holding the loaded Silero ONNX session
+_vad_template: Optional[SileroVADAnalyzer] = None
+
+
+def get_vad_template() -> SileroVADAnalyzer:
+    """Get the Silero VAD template singleton, loading the model on first use"""
+    global _vad_template
+    if _vad_template is None:
+        _vad_template = SileroVADAnalyzer()
+    return _vad_template
+
+
+def create_vad_analyzer() -> SileroVADAnalyzer:
+    """Create a per-connection VAD analyzer that reuses the loaded ONNX session.
+
+    The analyzer and its model wrapper keep per-stream state, so both are
+    shallow-copied and the model state reset; only the thread-safe
+    InferenceSession is shared between connections.
+
+    Pipecat builds that session with intra/inter-op threads set to 1 and runs
+    inference off the event loop from the input transport, so N devices cost
+    N single-threaded inferences rather than N x cores ORT threads.
+    """
+    template = get_vad_template()
+    analyzer = copy.copy(template)
+    analyzer._model = copy.copy(template._model)
+    analyzer._model.reset_states()
+    return analyzer
+
+
+# We store functions so objects (e.g. SileroVADAnalyzer) don't get
+# instantiated. The function will be called when the desired transport gets
+# selected.
+transport_params = {
+    "daily": lambda: DailyParams(
+        audio_in_enabled=True,
+        audio_out_enabled=True,
+        vad_analyzer=create_vad_analyzer(),
+    ),
+    "twilio": lambda: FastAPIWebsocketParams(
+        audio_in_enabled=True,
+        audio_out_enabled=True,
+        vad_analyzer=create_vad_analyzer(),
+    ),
+    "webrtc": lambda: TransportParams(
+        audio_in_enabled=True,
+        audio_out_enabled=True,
+        vad_analyzer=create_vad_analyzer(),
+    ),
+}
@@ -66,6 +66,34 @@ async def create_system_prompt(prompt_request: SystemPromptRequest, prompt_servi
         )
 
 
+@router.post("/bulk",
+             response_model=List[SystemPromptResponse],
+             status_code=status.HTTP_201_CREATED,
+             summary="Create system prompts in bulk",
+             description="Upload several system prompts in one request and one batched write")
+async def create_system_prompts_bulk(prompt_requests: List[SystemPromptRequest], prompt_service: PromptService = Depends(get_prompt_service_dependency)):
+    """
+    Create or update several system prompts at once
+    
+    The whole list is validated before anything is written, so an invalid
+    entry rejects the batch. Responses are returned in request order.
+    """
+    try:
+        return await prompt_service.create_system_prompts(prompt_requests)
+        
+    except ValidationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=handle_validation_error(e)
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=handle_generic_error(e)
+        )
+
+
 @router.get("/{season}/{episode}",
             response_model=SystemPromptResponse,
             summary="Get system prompt",
@@ -8,23 +8,26 @@ Works exactly like 07-interruptible.py but with dynamic system prompts
 import os
 import asyncio
 import aiohttp
+import httpx
 import uvicorn
 import argparse
 import sys
+import time
 import importlib.util
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Literal, Set, Tuple
 
 from dotenv import load_dotenv
 from loguru import logger
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from openai import AsyncOpenAI
+from fastapi import FastAPI, HTTPException, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ConfigDict
 
 # Pipecat imports - exactly like 07-interruptible.py
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -36,23 +39,44 @@ from pipecat.runner.utils import create_transport
 from pipecat.services.elevenlabs.tts import ElevenLabsHttpTTSService
 from pipecat.services.deepgram.stt import DeepgramSTTService
 from pipecat.services.openai.llm import OpenAILLMService
-from pipecat.transports.base_transport import BaseTransport, TransportParams
-from pipecat.transports.network.fastapi_websocket import FastAPIWebsocketParams
-from pipecat.transports.services.daily import DailyParams
+from pipecat.transports.base_transport import BaseTransport
 
 # Import our enhanced functionality
 from config.settings import get_settings, validate_settings
-from services.firebase_service import FirebaseService
+from services.firebase_service import get_firebase_service
+from services.conversation_service import invalidate_conversation_cache
+from pipelines import transport_params, get_vad_template
 from utils import setup_logging, handle_generic_error
 
 # Import the new comprehensive API routers
-from api.enhanced_users import router as enhanced_users_router
-from api.episodes import router as episodes_router
+from api.enhanced_users import router as enhanced_users_router, get_user_service
+from api.episodes import router as episodes_router, get_episode_service
 from api.conversations import router as conversations_router
 from routes.prompts import router as prompts_router
 
 load_dotenv(override=True)
 
+# Provider credentials, read once after .env is loaded
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
+CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY")
+ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
+
+# Static part of the /health services block; the keys above never change at runtime
+HEALTH_SERVICES = {
+    "firebase": "available",
+    "enhanced_users": "running",
+    "episodes": "running",
+    "conversations": "running",
+    "openai": "available" if OPENAI_API_KEY else "missing",
+    "deepgram": "available" if DEEPGRAM_API_KEY else "missing",
+    "cartesia": "available" if CARTESIA_API_KEY else "missing"
+}
+
+# Quiet by default in production; pass --log-level or LOG_LEVEL to see the per-offer lines
+setup_logging(os.getenv("LOG_LEVEL", "WARNING").upper())
+
 # Custom Audio Processors for Volume and Speed Control
 import numpy as np
 from scipy import signal
@@ -123,39 +147,169 @@ class AudioSpeedProcessor(FrameProcessor):
         else:
             await self.push_frame(frame, direction)
 
+class SharedClientOpenAILLMService(OpenAILLMService):
+    """OpenAI LLM service that sends requests over the shared HTTP/2 client"""
+    
+    def create_client(self, api_key=None, base_url=None, organization=None, project=None, default_headers=None, **kwargs):
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            organization=organization,
+            project=project,
+            http_client=get_openai_http_client(),
+            default_headers=default_headers,
+        )
+
 # Global state for managing active sessions - like 07-interruptible.py
 active_sessions: Dict[str, Any] = {}
 active_transports: Dict[str, BaseTransport] = {}
+# Open SmallWebRTCConnections, disconnected on shutdown
+active_connections: Set[Any] = set()
 
-# Transport params - exactly like 07-interruptible.py
-transport_params = {
-    "daily": lambda: DailyParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(),
-    ),
-    "twilio": lambda: FastAPIWebsocketParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(),
-    ),
-    "webrtc": lambda: TransportParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(),
-    ),
-}
+# Upper bound for closing all peer connections during shutdown
+SHUTDOWN_DISCONNECT_TIMEOUT_SECS = 10
+
+class WebRTCOfferRequest(BaseModel):
+    """WebRTC offer body sent to /api/offer"""
+    # Unknown keys (e.g. pc_id/restart_pc from the prebuilt client) are ignored
+    model_config = ConfigDict(extra="ignore", str_max_length=65536)
+    
+    sdp: str
+    type: Literal["offer", "answer"] = "offer"
+    pc_id: Optional[str] = None
+    device_id: Optional[str] = None
+    custom_system_prompt: Optional[str] = None
+
+# STUN/TURN URLs for server-side ICE gathering, parsed once. Empty by default:
+# each listed server costs a round-trip inside initialize(), and ESP32 mode
+# already advertises the public host through SDP munging.
+ICE_SERVERS = [url.strip() for url in os.getenv("ICE_SERVERS", "").split(",") if url.strip()]
+
+# Upper bound for SDP negotiation in /api/offer
+OFFER_INITIALIZE_TIMEOUT_SECS = 15
+
+# Cap on concurrently running bot pipelines per worker; offers beyond it get a 503
+_PIPELINE_SEM = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_PIPELINES", "32")))
+
+# Shared HTTP session for the TTS service so connections are reused across devices
+_http_session: Optional[aiohttp.ClientSession] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get shared aiohttp session singleton"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75, ttl_dns_cache=300)
+        )
+    return _http_session
+
+# Shared HTTP/2 client for OpenAI so concurrent devices multiplex over pooled connections
+_openai_http_client: Optional[httpx.AsyncClient] = None
+
+def get_openai_http_client() -> httpx.AsyncClient:
+    """Get shared OpenAI httpx client singleton"""
+    global _openai_http_client
+    if _openai_http_client is None or _openai_http_client.is_closed:
+        _openai_http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=75),
+        )
+    return _openai_http_client
+
+# Upper bound for one prewarm round; slow or dropped egress must not hold up
+# startup or the keep-warm loop
+PROVIDER_PREWARM_TIMEOUT_SECS = 3
+
+async def _prewarm_provider_connections():
+    """Open keep-alive connections to the AI providers so the first offer skips DNS/TLS setup"""
+    async def head_elevenlabs():
+        async with get_http_session().head("https://api.elevenlabs.io/v1/models"):
+            pass
+    
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                get_openai_http_client().head("https://api.openai.com/v1/models"),
+                head_elevenlabs(),
+                return_exceptions=True
+            ),
+            timeout=PROVIDER_PREWARM_TIMEOUT_SECS
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Provider connection prewarm timed out after {PROVIDER_PREWARM_TIMEOUT_SECS}s")
+        return
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Provider connection prewarm failed: {result}")
+
+# Re-warm interval for the pooled provider connections; kept below the 75s
+# keep-alive expiry so an idle server never lets the pools go cold
+PROVIDER_KEEPALIVE_INTERVAL_SECS = 60
+
+async def _keep_provider_connections_warm():
+    """Periodically touch the providers so pooled connections outlive idle periods"""
+    while True:
+        await asyncio.sleep(PROVIDER_KEEPALIVE_INTERVAL_SECS)
+        await _prewarm_provider_connections()
+
+def _build_services(http_session: aiohttp.ClientSession):
+    """Construct the STT/TTS/LLM services; blocking, so run it in a worker thread"""
+    stt = DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
+    
+    # Reuse the shared aiohttp session for TTS service
+    tts = ElevenLabsHttpTTSService(
+        aiohttp_session=http_session,
+        api_key=ELEVENLABS_API_KEY,
+        voice_id=ELEVENLABS_VOICE_ID,
+    )
+    
+    # Enhanced LLM with function calling for story completion
+    llm = SharedClientOpenAILLMService(
+        api_key=OPENAI_API_KEY,
+        model="gpt-5-nano-2025-08-07",  # Use GPT-5 Nano for better performance and efficiency
+    )
+    
+    return stt, tts, llm
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful LLM in a WebRTC call. Your goal is to demonstrate your capabilities in a succinct way. Your output will be converted to audio so don't include special characters in your answers. Respond to what the user said in a creative and helpful way."
 
 def get_default_system_prompt() -> str:
     """Default system prompt - exactly like 07-interruptible.py"""
-    return "You are a helpful LLM in a WebRTC call. Your goal is to demonstrate your capabilities in a succinct way. Your output will be converted to audio so don't include special characters in your answers. Respond to what the user said in a creative and helpful way."
+    return DEFAULT_SYSTEM_PROMPT
+
+# Resolved per-device system prompts, so a device reconnecting skips the user
+# and prompt reads. Progress writes in this module drop the device's entry; the
+# TTL bounds staleness from prompt edits and writes made by other workers
+SYSTEM_PROMPT_TTL_SECS = 300.0
+SYSTEM_PROMPT_CACHE_MAX_ENTRIES = 1024
+_system_prompt_cache: Dict[str, Tuple[float, str]] = {}
+
+def invalidate_system_prompt(device_id: str) -> None:
+    """Drop a device's cached system prompt after its user document changes"""
+    _system_prompt_cache.pop(device_id, None)
 
 async def get_enhanced_system_prompt(device_id: str = None) -> str:
-    """Get enhanced system prompt based on user data from Firebase"""
+    """Get enhanced system prompt based on user data from Firebase, cached per device"""
     
     if not device_id:
         return get_default_system_prompt()
     
+    entry = _system_prompt_cache.get(device_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    
+    prompt = await _build_enhanced_system_prompt(device_id)
+    # The default prompt is only returned when Firebase failed; retry on the next connect
+    if prompt is not DEFAULT_SYSTEM_PROMPT:
+        _system_prompt_cache.pop(device_id, None)
+        if len(_system_prompt_cache) >= SYSTEM_PROMPT_CACHE_MAX_ENTRIES:
+            _system_prompt_cache.pop(next(iter(_system_prompt_cache)), None)
+        _system_prompt_cache[device_id] = (time.monotonic() + SYSTEM_PROMPT_TTL_SECS, prompt)
+    return prompt
+
+async def _build_enhanced_system_prompt(device_id: str) -> str:
+    """Build the system prompt for a device from its user document and current episode"""
     try:
         # Get Firebase service
         from services.firebase_service import get_firebase_service
@@ -294,17 +448,66 @@ async def lifespan(app: FastAPI):
     logger.info(f"✅ Server configured - App: {settings.app_name} v{settings.app_version}")
     logger.info(f"📊 Debug mode: {settings.debug}")
     
-    # Initialize services
-    firebase_service = FirebaseService()
+    # Check the bot's provider keys once here instead of on every connection
+    missing_keys = [
+        name for name, value in (
+            ("OPENAI_API_KEY", OPENAI_API_KEY),
+            ("DEEPGRAM_API_KEY", DEEPGRAM_API_KEY),
+            ("ELEVENLABS_API_KEY", ELEVENLABS_API_KEY),
+        ) if not value
+    ]
+    if missing_keys:
+        logger.error(f"❌ Missing API keys, voice sessions will fail: {', '.join(missing_keys)}")
+    
+    # Initialize the shared service singletons once, before the first request
+    firebase_service = get_firebase_service()
     if hasattr(firebase_service, 'use_firebase') and firebase_service.use_firebase:
         logger.info("🔥 Firebase integration enabled")
     else:
         logger.info("💾 Using local storage (Firebase disabled)")
+    get_episode_service()
+    
+    # Load the Silero VAD model off the event loop and warm provider connections
+    # in parallel so the first offer matches steady-state latency
+    await asyncio.gather(
+        asyncio.get_running_loop().run_in_executor(None, get_vad_template),
+        _prewarm_provider_connections()
+    )
+    logger.info("🎙️ Silero VAD model loaded and provider connections warmed")
+    
+    # Persist buffered last-active timestamps in periodic batches
+    user_service = get_user_service()
+    last_active_flusher = asyncio.create_task(user_service.run_last_active_flusher())
+    
+    # Keep the provider connection pools warm between sessions
+    provider_keepalive = asyncio.create_task(_keep_provider_connections_warm())
     
     yield
     
     # Shutdown
     logger.info("👋 Enhanced Pipecat Server shutting down...")
+    
+    # Close peer connections in parallel; one peer that never ACKs must not block exit
+    if active_connections:
+        tasks = [asyncio.create_task(conn.disconnect()) for conn in list(active_connections)]
+        _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_DISCONNECT_TIMEOUT_SECS)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Abandoned {len(pending)} WebRTC connection(s) that did not close in time")
+        active_connections.clear()
+    
+    # Stop the periodic tasks and write whatever is still buffered
+    last_active_flusher.cancel()
+    provider_keepalive.cancel()
+    await asyncio.gather(last_active_flusher, provider_keepalive, return_exceptions=True)
+    await user_service.flush_last_active()
+    
+    # Close the shared HTTP clients
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    if _openai_http_client is not None and not _openai_http_client.is_closed:
+        await _openai_http_client.aclose()
 
 def create_enhanced_app() -> FastAPI:
     """Create enhanced FastAPI application with all features"""
@@ -333,14 +536,18 @@ def create_enhanced_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
-        debug=settings.debug
+        debug=settings.debug,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
+        allow_origins=settings.cors_origins,
+        # Credentials can't be combined with a wildcard origin; with both set,
+        # Starlette echoes and varies on the origin of every request instead of
+        # sending a static "*" header
+        allow_credentials=settings.cors_allow_credentials and "*" not in settings.cors_origins,
         allow_methods=["*"],
         allow_headers=["*"],
     )
@@ -390,23 +597,17 @@ def create_enhanced_app() -> FastAPI:
     @app.get("/health",
              summary="Health check",
              description="Check server health and status with ESP32 support")
-    async def health_check():
+    async def health_check(response: Response):
         """Health check endpoint"""
+        # Lets pollers behind a shared cache collapse onto one request every few seconds
+        response.headers["Cache-Control"] = "public, max-age=5"
         return {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "esp32_mode": ESP32_MODE,
             "esp32_host": ESP32_HOST if ESP32_MODE else None,
             "sdp_munging": "enabled" if ESP32_MODE else "disabled",
-            "services": {
-                "firebase": "available",
-                "enhanced_users": "running", 
-                "episodes": "running",
-                "conversations": "running",
-                "openai": "available" if os.getenv("OPENAI_API_KEY") else "missing",
-                "deepgram": "available" if os.getenv("DEEPGRAM_API_KEY") else "missing",
-                "cartesia": "available" if os.getenv("CARTESIA_API_KEY") else "missing"
-            }
+            "services": HEALTH_SERVICES
         }
 
     # Import WebRTC static files and client from Pipecat
@@ -1425,26 +1626,38 @@ def create_enhanced_app() -> FastAPI:
     @app.post("/api/offer",
               summary="WebRTC offer handler", 
               description="Handle WebRTC offer from ESP32 devices with custom prompts and SDP munging")
-    async def handle_webrtc_offer(request: Request, background_tasks: BackgroundTasks):
+    async def handle_webrtc_offer(offer: WebRTCOfferRequest, request: Request, background_tasks: BackgroundTasks):
         """Handle WebRTC offers exactly like 07-interruptible.py but with Firebase integration and ESP32 support"""
+        # Set while this handler holds a pipeline slot; enhanced_bot_webrtc releases it once scheduled
+        slot_held = False
         try:
-            body = await request.json()
+            # Shed load before allocating a peer connection if every pipeline slot is taken.
+            # The slot is claimed with no await in between, so concurrent offers can't all pass
+            if _PIPELINE_SEM.locked():
+                logger.warning("Rejecting WebRTC offer: all pipeline slots are busy")
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "Server busy, retry shortly"},
+                    headers={"Retry-After": "5"}
+                )
+            await _PIPELINE_SEM.acquire()
+            slot_held = True
             
             # Extract device ID from multiple sources
             device_id = (
-                body.get("device_id") or 
+                offer.device_id or 
                 request.headers.get("X-Device-ID") or
                 request.query_params.get("device_id") or
                 None
             )
             
             # Extract custom system prompt if provided
-            custom_system_prompt = body.get("custom_system_prompt")
+            custom_system_prompt = offer.custom_system_prompt
             is_custom_prompt = request.headers.get("X-Custom-Prompt") == "true"
             
-            logger.info(f"Received WebRTC offer from device: {device_id}")
+            logger.info("Received WebRTC offer from device: {}", device_id)
             if custom_system_prompt:
-                logger.info(f"Using custom system prompt ({len(custom_system_prompt)} characters)")
+                logger.opt(lazy=True).info("Using custom system prompt ({} characters)", lambda: len(custom_system_prompt))
             
             # Store session info with custom prompt info
             session_id = f"webrtc_{device_id or 'unknown'}_{len(active_sessions)}"
@@ -1453,6 +1666,7 @@ def create_enhanced_app() -> FastAPI:
                 "created_at": datetime.now(timezone.utc),
                 "status": "connecting",
                 "type": "webrtc",
+                "worker_id": os.getpid(),
                 "custom_prompt": bool(custom_system_prompt),
                 "prompt_length": len(custom_system_prompt) if custom_system_prompt else 0
             }
@@ -1463,16 +1677,27 @@ def create_enhanced_app() -> FastAPI:
             from pipecat.runner.types import SmallWebRTCRunnerArguments
             
             # Create connection and get answer
-            webrtc_connection = SmallWebRTCConnection()
-            offer_sdp = body.get("sdp", "")
-            offer_type = body.get("type", "offer")
+            webrtc_connection = SmallWebRTCConnection(ice_servers=ICE_SERVERS)
+            active_connections.add(webrtc_connection)
+            offer_sdp = offer.sdp
+            offer_type = offer.type
             
-            await webrtc_connection.initialize(offer_sdp, offer_type)
-            answer = webrtc_connection.get_answer()
+            # Don't let a stuck negotiation pin the connection in memory
+            try:
+                await asyncio.wait_for(
+                    webrtc_connection.initialize(offer_sdp, offer_type),
+                    timeout=OFFER_INITIALIZE_TIMEOUT_SECS
+                )
+                answer = webrtc_connection.get_answer()
+            except BaseException:
+                active_sessions.pop(session_id, None)
+                active_connections.discard(webrtc_connection)
+                await webrtc_connection.disconnect()
+                raise
             
             # Apply ESP32 SDP munging for compatibility - CRUCIAL for ESP32!
             if ESP32_MODE and ESP32_HOST and ESP32_HOST not in ["localhost", "127.0.0.1", "0.0.0.0"]:
-                logger.info(f"Applying ESP32 SDP munging for host: {ESP32_HOST}")
+                logger.info("Applying ESP32 SDP munging for host: {}", ESP32_HOST)
                 answer["sdp"] = smallwebrtc_sdp_munging(answer["sdp"], ESP32_HOST)
             else:
                 # Fallback: try to get host from environment or request
@@ -1481,7 +1706,7 @@ def create_enhanced_app() -> FastAPI:
                     host = os.getenv("SERVER_HOST", "64.227.157.74")
                 
                 if ESP32_MODE and host and host not in ["localhost", "127.0.0.1", "0.0.0.0"]:
-                    logger.info(f"Applying ESP32 SDP munging for fallback host: {host}")
+                    logger.info("Applying ESP32 SDP munging for fallback host: {}", host)
                     answer["sdp"] = smallwebrtc_sdp_munging(answer["sdp"], host)
                 elif ESP32_MODE:
                     # If we're in ESP32 mode but don't have a valid host, disable SDP munging
@@ -1495,20 +1720,25 @@ def create_enhanced_app() -> FastAPI:
             
             # Start the enhanced bot in background with custom prompt
             background_tasks.add_task(enhanced_bot_webrtc, runner_args, device_id, custom_system_prompt)
+            slot_held = False
             
             # Update session status
             active_sessions[session_id]["status"] = "connected"
             
-            logger.info(f"WebRTC connection established for device: {device_id}")
+            logger.info("WebRTC connection established for device: {}", device_id)
             if custom_system_prompt:
-                logger.info(f"Using custom system prompt for enhanced AI personality")
+                logger.info("Using custom system prompt for enhanced AI personality")
             
-            # Return the munged SDP answer for ESP32 compatibility
-            return answer
+            # Return the munged SDP answer for ESP32 compatibility, serialized directly
+            return ORJSONResponse(answer)
             
         except Exception as e:
             logger.error(f"Error handling WebRTC offer: {e}")
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            # Negotiation failed before the bot was scheduled
+            if slot_held:
+                _PIPELINE_SEM.release()
 
     # WebRTC client info endpoint
     @app.get("/client-info",
@@ -1638,6 +1868,7 @@ def create_enhanced_app() -> FastAPI:
             
             logger.info(f"💾 Updating user document with progress...")
             await firebase_service.update_document("users", device_id, updates)
+            invalidate_system_prompt(device_id)
             
             logger.info(f"✅ Manual completion for {device_id}: +{len(new_words)} words, +{len(new_topics)} topics, +{time_spent_minutes} mins")
             
@@ -1710,6 +1941,7 @@ def create_enhanced_app() -> FastAPI:
             }
             
             await firebase_service.update_document("users", device_id, updates)
+            invalidate_system_prompt(device_id)
             
             logger.info(f"Advanced user {device_id} from S{current_season}E{current_episode} to S{new_season}E{new_episode}")
             
@@ -1767,6 +1999,7 @@ def create_enhanced_app() -> FastAPI:
                 
                 # Save to Firebase using device_id as document ID
                 await firebase_service.set_document("users", device_id, default_user_data)
+                invalidate_system_prompt(device_id)
                 
                 created_devices.append({
                     "device_id": device_id,
@@ -2052,25 +2285,34 @@ def create_enhanced_app() -> FastAPI:
 
 async def run_enhanced_bot(transport: BaseTransport, runner_args: RunnerArguments, device_id: str = None, custom_system_prompt: str = None):
     """Enhanced bot function - exactly like 07-interruptible.py but with Firebase integration and custom prompts"""
-    logger.info(f"Starting enhanced bot for device: {device_id}")
+    logger.info("Starting enhanced bot for device: {}", device_id)
     if custom_system_prompt:
-        logger.info(f"Using custom system prompt ({len(custom_system_prompt)} characters)")
+        logger.opt(lazy=True).info("Using custom system prompt ({} characters)", lambda: len(custom_system_prompt))
     
     conversation_id = None
     user = None
     firebase_service = None
     conversation_start_time = datetime.now(timezone.utc)
+    prompt_task = services_task = None
     
     try:
+        # The Firebase system prompt, the provider services and the conversation
+        # session don't depend on each other, so their round trips and the service
+        # build overlap instead of adding up before the pipeline starts
+        prompt_task = None if custom_system_prompt else asyncio.create_task(get_enhanced_system_prompt(device_id))
+        
+        # Services - exactly like 07-interruptible.py, built in a worker thread so
+        # other devices' signaling isn't stalled. The shared HTTP clients are
+        # created here so the singletons are set up on the loop, not in the thread.
+        get_openai_http_client()
+        services_task = asyncio.create_task(asyncio.to_thread(
+            _build_services, get_http_session()
+        ))
+        
         # Initialize conversation tracking if device_id is provided
         if device_id:
-            from services.firebase_service import get_firebase_service
-            from services.enhanced_user_service import EnhancedUserService
-            from services.conversation_service import ConversationService
-            
             firebase_service = get_firebase_service()
-            user_service = EnhancedUserService(firebase_service)
-            conversation_service = ConversationService(firebase_service)
+            user_service = get_user_service()
             
             # Get user and start conversation session
             user = await user_service.get_user_by_device_id(device_id)
@@ -2091,35 +2333,16 @@ async def run_enhanced_bot(transport: BaseTransport, runner_args: RunnerArgument
                     conversation_id,
                     transcript.to_dict()
                 )
+                invalidate_conversation_cache(conversation_id, user.email)
                 
                 logger.info(f"Started conversation session {conversation_id} for user {user.email}")
 
-        # Services - exactly like 07-interruptible.py
-        stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
-
-        # Debug: Check if API key is loaded
-        elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY")
-        elevenlabs_voice_id = os.getenv("ELEVENLABS_VOICE_ID")
-        logger.info(f"ElevenLabs API key loaded: {elevenlabs_api_key[:10] if elevenlabs_api_key else 'None'}...")
-
-        # Create aiohttp session for TTS service
-        session = aiohttp.ClientSession()
-        tts = ElevenLabsHttpTTSService(
-            aiohttp_session=session,
-            api_key=elevenlabs_api_key,
-            voice_id=elevenlabs_voice_id,
-        )
+        stt, tts, llm = await services_task
 
         # Audio processing for volume and speed enhancement
         volume_processor = AudioVolumeProcessor(volume_multiplier=1.5)  # 50% volume increase
         speed_processor = AudioSpeedProcessor(speed_multiplier=1.1)     # 1.1x speed increase
 
-        # Enhanced LLM with function calling for story completion
-        llm = OpenAILLMService(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-5-nano-2025-08-07",  # Use GPT-5 Nano for better performance and efficiency
-        )
-
         # Define story completion functions for OpenAI to call
         story_completion_functions = [
             {
@@ -2201,7 +2424,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
 - Keep responses conversational since they will be spoken aloud"""
             logger.info(f"Using enhanced custom system prompt for interactive story")
         else:
-            system_prompt = await get_enhanced_system_prompt(device_id)
+            system_prompt = await prompt_task
             # Add story completion instructions to Firebase prompts too
             system_prompt += """
 
@@ -2281,6 +2504,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
                         }
                         
                         await firebase_service.update_document("users", device_id, updates)
+                        invalidate_system_prompt(device_id)
                         
                         logger.info(f"Updated user {device_id}: +{len(new_words)} words, +{len(new_topics)} topics, +{time_spent_minutes:.1f} mins")
                         
@@ -2297,6 +2521,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
                                 "story_completed": arguments.get("story_completed", True)
                             }
                             await firebase_service.update_document("conversation_transcripts", conversation_id, completion_data)
+                            invalidate_conversation_cache(conversation_id, user.email if user else None)
                     
                     return {
                         "status": "success",
@@ -2344,6 +2569,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
                         }
                         
                         await firebase_service.update_document("users", device_id, updates)
+                        invalidate_system_prompt(device_id)
                         
                         logger.info(f"Advanced user {device_id} to Season {new_season}, Episode {new_episode}")
                     
@@ -2375,20 +2601,23 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
         task = PipelineTask(
             pipeline,
             params=PipelineParams(
+                allow_interruptions=True,
                 enable_metrics=True,
                 enable_usage_metrics=True,
+                # Report TTFB for every turn, not just the first, so stage overlap is measurable
+                report_only_initial_ttfb=False,
             ),
             idle_timeout_secs=runner_args.pipeline_idle_timeout_secs,
         )
 
         @transport.event_handler("on_client_connected")
         async def on_client_connected(transport, client):
-            logger.info(f"Client connected - device: {device_id}")
+            logger.info("Client connected - device: {}", device_id)
             # Update user last seen if device_id provided  
             if device_id:
                 try:
                     # For now, just log the connection - user service integration can be added later
-                    logger.info(f"Device {device_id} connected and active")
+                    logger.info("Device {} connected and active", device_id)
                 except Exception as e:
                     logger.warning(f"Failed to update last seen for {device_id}: {e}")
             
@@ -2404,7 +2633,11 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
 
         @transport.event_handler("on_client_disconnected")
         async def on_client_disconnected(transport, client):
-            logger.info(f"Client disconnected - device: {device_id}")
+            logger.info("Client disconnected - device: {}", device_id)
+            
+            # Stop the pipeline right away so the LLM/TTS don't keep working for a
+            # closed peer while the transcript is saved; awaited at the end
+            cancel_pipeline = asyncio.create_task(task.cancel())
             
             # Finalize conversation session if it exists
             if device_id and conversation_id and firebase_service:
@@ -2426,6 +2659,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
                         transcript_doc['total_session_time_minutes'] = final_time_spent
                         
                         await firebase_service.update_document("conversation_transcripts", conversation_id, transcript_doc)
+                        invalidate_conversation_cache(conversation_id, user.email if user else None)
                         
                         # Update user progress if appropriate
                         if user:
@@ -2439,11 +2673,7 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
                 del active_sessions[device_id]
             if device_id and device_id in active_transports:
                 del active_transports[device_id]
-            await task.cancel()
-            
-            # Close aiohttp session
-            if 'session' in locals():
-                await session.close()
+            await cancel_pipeline
 
         runner = PipelineRunner(handle_sigint=runner_args.handle_sigint)
         await runner.run(task)
@@ -2454,10 +2684,14 @@ IMPORTANT STORY COMPLETION INSTRUCTIONS:
             del active_sessions[device_id]
         if device_id and device_id in active_transports:
             del active_transports[device_id]
-        # Close aiohttp session on error
-        if 'session' in locals():
-            await session.close()
         raise
+    finally:
+        # If setup failed before the prompt and services were awaited, stop them and
+        # retrieve their outcome so nothing is left running or reported as unretrieved
+        setup_tasks = [task for task in (prompt_task, services_task) if task is not None]
+        for task in setup_tasks:
+            task.cancel()
+        await asyncio.gather(*setup_tasks, return_exceptions=True)
 
 async def enhanced_bot(runner_args: RunnerArguments, device_id: str = None, custom_system_prompt: str = None):
     """Enhanced bot entry point - like 07-interruptible.py but with device_id and custom prompts"""
@@ -2466,28 +2700,47 @@ async def enhanced_bot(runner_args: RunnerArguments, device_id: str = None, cust
     await run_enhanced_bot(transport, runner_args, device_id, custom_system_prompt)
 
 async def enhanced_bot_webrtc(runner_args: SmallWebRTCRunnerArguments, device_id: str = None, custom_system_prompt: str = None):
-    """Enhanced bot entry point for WebRTC connections with Firebase integration and custom prompts"""
+    """Enhanced bot entry point for WebRTC connections with Firebase integration and custom prompts.
+
+    Runs in a pipeline slot already taken by handle_webrtc_offer, and releases it when done.
+    """
     from pipecat.transports.network.small_webrtc import SmallWebRTCTransport
     from pipecat.runner.utils import _get_transport_params
     
-    # Get transport params for webrtc - exactly like working examples
-    transport_params_obj = _get_transport_params("webrtc", transport_params)
-    
-    # Create WebRTC transport from connection
-    transport = SmallWebRTCTransport(runner_args.webrtc_connection, transport_params_obj)
-    
-    # Store in active transports
-    active_transports[device_id or "default"] = transport
-    
-    # Run the enhanced bot with WebRTC transport and custom prompt
-    await run_enhanced_bot(transport, runner_args, device_id, custom_system_prompt)
+    try:
+        # Get transport params for webrtc - exactly like working examples
+        transport_params_obj = _get_transport_params("webrtc", transport_params)
+        
+        # Create WebRTC transport from connection
+        transport = SmallWebRTCTransport(runner_args.webrtc_connection, transport_params_obj)
+        
+        # Store in active transports
+        active_transports[device_id or "default"] = transport
+        
+        # Run the enhanced bot with WebRTC transport and custom prompt
+        await run_enhanced_bot(transport, runner_args, device_id, custom_system_prompt)
+    finally:
+        # Free the pipeline slot first so a failing disconnect can't leak it
+        _PIPELINE_SEM.release()
+        # Always release the peer connection, even if the pipeline raised
+        active_transports.pop(device_id or "default", None)
+        active_connections.discard(runner_args.webrtc_connection)
+        await runner_args.webrtc_connection.disconnect()
 
 # Create the enhanced app
 app = create_enhanced_app()
 
-# Global ESP32 mode flag
-ESP32_MODE = False
-ESP32_HOST = None
+# Global ESP32 mode flag - read from the environment so every uvicorn worker
+# process picks up the values chosen on the command line
+ESP32_MODE = os.getenv("ESP32_MODE", "false").lower() == "true"
+ESP32_HOST = os.getenv("ESP32_HOST")
+
+# Idle keep-alive window for client connections, in seconds (uvicorn defaults to 5)
+KEEP_ALIVE_TIMEOUT_SECS = int(os.getenv("KEEP_ALIVE_TIMEOUT_SECS", "75"))
+
+# uvloop is skipped on Windows (see requirements.txt); use the stock loop there
+# rather than failing at startup
+EVENT_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
 
 def main():
     global ESP32_MODE, ESP32_HOST
@@ -2496,8 +2749,9 @@ def main():
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=7860, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
-    parser.add_argument("--log-level", default="info", help="Log level")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "warning"), help="Log level")
     parser.add_argument("--esp32", action="store_true", help="Enable ESP32 mode with SDP munging")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")), help="Number of uvicorn worker processes (default: WEB_CONCURRENCY or 1)")
     
     args = parser.parse_args()
     
@@ -2505,6 +2759,16 @@ def main():
     ESP32_MODE = args.esp32
     ESP32_HOST = args.host
     
+    # Worker processes re-import this module, so hand the flags over via env
+    os.environ["ESP32_MODE"] = "true" if ESP32_MODE else "false"
+    os.environ["ESP32_HOST"] = ESP32_HOST
+    os.environ["LOG_LEVEL"] = args.log_level
+    setup_logging(args.log_level.upper())
+    
+    if args.workers > 1 and args.reload:
+        logger.error("--workers cannot be combined with --reload")
+        sys.exit(1)
+    
     # Validate ESP32 requirements
     if args.esp32 and args.host in ["localhost", "127.0.0.1"]:
         logger.error("For ESP32, you need to specify `--host IP` so we can do SDP munging.")
@@ -2515,17 +2779,26 @@ def main():
     print(f"   Port: {args.port}")
     print(f"   Log Level: {args.log_level}")
     print(f"   Reload: {args.reload}")
+    print(f"   Workers: {args.workers}")
     if args.esp32:
         print(f"🤖 ESP32 mode enabled with SDP munging for host: {args.host}")
     
     # Run the server directly
+    # Multiple workers need an import string so each process builds its own app;
+    # WebRTC connections stay pinned to the worker that accepted the offer
     uvicorn.run(
-        app,
+        "run_server:app" if args.workers > 1 else app,
         host=args.host,
         port=args.port,
         log_level=args.log_level,
         reload=args.reload,
-        access_log=True
+        access_log=True,
+        workers=args.workers,
+        loop=EVENT_LOOP,
+        http="httptools",
+        # asyncio/uvloop already set TCP_NODELAY on accepted sockets; keep idle
+        # connections open so repeat signaling calls skip the TCP/TLS handshake
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT_SECS
     )
 
 if __name__ == "__main__":
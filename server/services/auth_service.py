@@ -5,6 +5,7 @@ Simple Authentication service for ESP32-Firebase integration
 import jwt
 import hashlib
 import secrets
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Any
@@ -12,6 +13,18 @@ from loguru import logger
 
 from models.auth_models import ClaimToken, DeviceRegistration, DeviceStatus, ClaimTokenStatus, SessionStatus
 
+# Snapshot of get_active_devices, rebuilt when a session is created or
+# reactivated in this process; the TTL bounds staleness from other workers
+ACTIVE_DEVICES_SNAPSHOT_TTL_SECS = 5.0
+_active_devices_snapshot: Optional[List[Dict[str, Any]]] = None
+_active_devices_snapshot_at: float = 0.0
+
+
+def _invalidate_active_devices_snapshot():
+    """Force the next get_active_devices call to re-query Firebase"""
+    global _active_devices_snapshot
+    _active_devices_snapshot = None
+
 
 def get_auth_service():
     """Get authentication service with Firebase"""
@@ -255,6 +268,8 @@ class AuthenticationService:
                 }
             )
             
+            _invalidate_active_devices_snapshot()
+            
             # Update device status
             await self.firebase.update_document(
                 self.device_registrations_collection,
@@ -322,6 +337,8 @@ class AuthenticationService:
                         "status": SessionStatus.ACTIVE.value
                     }
                 )
+                if session_data.get("status") != SessionStatus.ACTIVE.value:
+                    _invalidate_active_devices_snapshot()
                 
                 return {
                     "success": True,
@@ -340,14 +357,21 @@ class AuthenticationService:
         return device_reg is not None and device_reg.status in [DeviceStatus.CLAIMED, DeviceStatus.ACTIVE]
 
     async def get_active_devices(self) -> List[Dict[str, Any]]:
-        """Get all active devices"""
+        """Get all active devices, served from the snapshot while it is fresh"""
+        global _active_devices_snapshot, _active_devices_snapshot_at
         try:
+            if (
+                _active_devices_snapshot is not None
+                and time.monotonic() - _active_devices_snapshot_at < ACTIVE_DEVICES_SNAPSHOT_TTL_SECS
+            ):
+                return list(_active_devices_snapshot)
+            
             sessions_data = await self.firebase.query_collection(
                 self.device_sessions_collection,
                 filters=[{"field": "status", "operator": "==", "value": SessionStatus.ACTIVE.value}]
             )
             
-            return [
+            _active_devices_snapshot = [
                 {
                     "device_id": session.get("device_id"),
                     "email": session.get("email"),
@@ -356,6 +380,8 @@ class AuthenticationService:
                 }
                 for session in sessions_data
             ]
+            _active_devices_snapshot_at = time.monotonic()
+            return list(_active_devices_snapshot)
         except Exception as e:
             logger.error(f"Error getting active devices: {e}")
             return []
@@ -368,19 +394,21 @@ class AuthenticationService:
                 filters=[{"field": "email", "operator": "==", "value": email}]
             )
             
+            # One batched read for every bound device instead of one per binding
+            device_ids = [binding.get("device_id") for binding in bindings if binding.get("device_id")]
+            devices_data = await self.firebase.get_documents(self.device_registrations_collection, device_ids)
+            
             devices = []
-            for binding in bindings:
-                device_id = binding.get("device_id")
-                if device_id:
-                    device_data = await self.firebase.get_document(self.device_registrations_collection, device_id)
-                    if device_data:
-                        devices.append({
-                            "device_id": device_data["device_id"],
-                            "hardware_id": device_data["hardware_id"],
-                            "status": device_data["status"],
-                            "claimed_at": device_data.get("claimed_at"),
-                            "last_seen": device_data.get("last_seen")
-                        })
+            for device_id in device_ids:
+                device_data = devices_data.get(device_id)
+                if device_data:
+                    devices.append({
+                        "device_id": device_data["device_id"],
+                        "hardware_id": device_data["hardware_id"],
+                        "status": device_data["status"],
+                        "claimed_at": device_data.get("claimed_at"),
+                        "last_seen": device_data.get("last_seen")
+                    })
             
             return devices
         except Exception as e:
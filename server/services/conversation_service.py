@@ -2,12 +2,65 @@
 Conversation Service for managing conversation transcripts and summaries
 """
 
-from typing import List, Dict, Optional, Any
+import asyncio
+import time
+from collections import Counter
+from operator import attrgetter
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
 from models.conversation import ConversationTranscript, ConversationSummary, ConversationMessage
 from services.firebase_service import FirebaseService
+from utils.exceptions import ServiceException
+
+# In-process read cache for transcripts, summaries and per-user lists. Writes
+# through this service invalidate their entries; the TTLs bound staleness from
+# writes made elsewhere (the bot pipeline, other workers). Invalidation never
+# reaches other worker processes, and finished transcripts can still be deleted,
+# summarized or appended to, so they are only trusted a few minutes longer
+ACTIVE_CONVERSATION_TTL_SECS = 60.0
+FINISHED_CONVERSATION_TTL_SECS = 300.0
+CONVERSATION_CACHE_MAX_ENTRIES = 2048
+_conversation_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cache_get(key: str) -> Any:
+    """Get a cached value, or None if it is missing or expired"""
+    entry = _conversation_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _conversation_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_set(key: str, value: Any, ttl: float) -> None:
+    """Cache a value, evicting the oldest entry when the cache is full"""
+    _conversation_cache.pop(key, None)
+    if len(_conversation_cache) >= CONVERSATION_CACHE_MAX_ENTRIES:
+        _conversation_cache.pop(next(iter(_conversation_cache)), None)
+    _conversation_cache[key] = (time.monotonic() + ttl, value)
+
+
+def invalidate_conversation_cache(conversation_id: str, user_email: Optional[str] = None) -> None:
+    """Drop cached reads for a conversation and its owner's lists"""
+    if user_email is None:
+        # Conversation ids are "{email}_{season}_{episode}_{timestamp}"
+        user_email = conversation_id.rsplit("_", 3)[0]
+    for key in (
+        f"conv:{conversation_id}",
+        f"summary:{conversation_id}",
+        f"user_convs:{user_email}",
+        f"user_summaries:{user_email}",
+        f"user_progression:{user_email}",
+        f"user_summary:{user_email}",
+        f"user_search:{user_email}",
+    ):
+        _conversation_cache.pop(key, None)
+
 
 class ConversationService:
     """Service for managing conversation transcripts and summaries"""
@@ -35,6 +88,7 @@ class ConversationService:
                 transcript.to_dict()
             )
             
+            invalidate_conversation_cache(conversation_id, user_email)
             logger.info(f"Created conversation: {conversation_id}")
             return conversation_id
             
@@ -70,13 +124,24 @@ class ConversationService:
         except Exception as e:
             logger.error(f"Error adding message to conversation {conversation_id}: {e}")
             return False
+        finally:
+            # The cached transcript was mutated in place above
+            invalidate_conversation_cache(conversation_id)
     
     async def get_conversation_transcript(self, conversation_id: str) -> Optional[ConversationTranscript]:
         """Get conversation transcript by ID"""
         try:
+            key = f"conv:{conversation_id}"
+            transcript = _cache_get(key)
+            if transcript is not None:
+                return transcript
+            
             data = await self.firebase.get_document(self.transcripts_collection, conversation_id)
             if data:
-                return ConversationTranscript.from_dict(data)
+                transcript = ConversationTranscript.from_dict(data)
+                ttl = ACTIVE_CONVERSATION_TTL_SECS if transcript.status == "active" else FINISHED_CONVERSATION_TTL_SECS
+                _cache_set(key, transcript, ttl)
+                return transcript
             return None
         except Exception as e:
             logger.error(f"Error getting conversation transcript {conversation_id}: {e}")
@@ -85,15 +150,20 @@ class ConversationService:
     async def get_user_conversations(self, user_email: str, limit: Optional[int] = None) -> List[ConversationTranscript]:
         """Get all conversations for a user"""
         try:
-            conversations_data = await self.firebase.query_collection(
-                self.transcripts_collection,
-                [("user_email", "==", user_email)]
-            )
-            
-            conversations = [ConversationTranscript.from_dict(data) for data in conversations_data]
-            # Sort by start time descending (most recent first)
-            conversations.sort(key=lambda x: x.start_time, reverse=True)
-            
+            key = f"user_convs:{user_email}"
+            conversations = _cache_get(key)
+            if conversations is None:
+                conversations_data = await self.firebase.query_collection(
+                    self.transcripts_collection,
+                    [("user_email", "==", user_email)]
+                )
+                
+                conversations = [ConversationTranscript.from_dict(data) for data in conversations_data]
+                # Sort by start time descending (most recent first)
+                conversations.sort(key=lambda x: x.start_time, reverse=True)
+                _cache_set(key, conversations, ACTIVE_CONVERSATION_TTL_SECS)
+            
+            conversations = list(conversations)
             if limit:
                 conversations = conversations[:limit]
             
@@ -141,14 +211,16 @@ class ConversationService:
         except Exception as e:
             logger.error(f"Error finishing conversation {conversation_id}: {e}")
             return False
+        finally:
+            invalidate_conversation_cache(conversation_id)
     
     async def create_conversation_summary(self, conversation_id: str, summary_data: Dict[str, Any]) -> ConversationSummary:
         """Create a summary for a completed conversation"""
+        transcript = await self.get_conversation_transcript(conversation_id)
+        if not transcript:
+            raise ServiceException(f"Conversation {conversation_id} not found")
+        
         try:
-            transcript = await self.get_conversation_transcript(conversation_id)
-            if not transcript:
-                raise ValueError(f"Conversation {conversation_id} not found")
-            
             summary = ConversationSummary(
                 conversation_id=conversation_id,
                 user_email=transcript.user_email,
@@ -170,6 +242,7 @@ class ConversationService:
                 summary.to_dict()
             )
             
+            invalidate_conversation_cache(conversation_id, transcript.user_email)
             logger.info(f"Created conversation summary: {conversation_id}")
             return summary
             
@@ -180,9 +253,16 @@ class ConversationService:
     async def get_conversation_summary(self, conversation_id: str) -> Optional[ConversationSummary]:
         """Get conversation summary by conversation ID"""
         try:
+            key = f"summary:{conversation_id}"
+            summary = _cache_get(key)
+            if summary is not None:
+                return summary
+            
             data = await self.firebase.get_document(self.summaries_collection, conversation_id)
             if data:
-                return ConversationSummary.from_dict(data)
+                summary = ConversationSummary.from_dict(data)
+                _cache_set(key, summary, FINISHED_CONVERSATION_TTL_SECS)
+                return summary
             return None
         except Exception as e:
             logger.error(f"Error getting conversation summary {conversation_id}: {e}")
@@ -191,15 +271,20 @@ class ConversationService:
     async def get_user_summaries(self, user_email: str, limit: Optional[int] = None) -> List[ConversationSummary]:
         """Get all conversation summaries for a user"""
         try:
-            summaries_data = await self.firebase.query_collection(
-                self.summaries_collection,
-                [("user_email", "==", user_email)]
-            )
-            
-            summaries = [ConversationSummary.from_dict(data) for data in summaries_data]
-            # Sort by created date descending
-            summaries.sort(key=lambda x: x.created_at, reverse=True)
-            
+            key = f"user_summaries:{user_email}"
+            summaries = _cache_get(key)
+            if summaries is None:
+                summaries_data = await self.firebase.query_collection(
+                    self.summaries_collection,
+                    [("user_email", "==", user_email)]
+                )
+                
+                summaries = [ConversationSummary.from_dict(data) for data in summaries_data]
+                # Sort by created date descending
+                summaries.sort(key=lambda x: x.created_at, reverse=True)
+                _cache_set(key, summaries, ACTIVE_CONVERSATION_TTL_SECS)
+            
+            summaries = list(summaries)
             if limit:
                 summaries = summaries[:limit]
             
@@ -211,12 +296,15 @@ class ConversationService:
     async def get_conversation_analytics(self, conversation_id: str) -> Dict[str, Any]:
         """Get comprehensive analytics for a conversation"""
         try:
-            transcript = await self.get_conversation_transcript(conversation_id)
-            summary = await self.get_conversation_summary(conversation_id)
+            transcript, summary = await asyncio.gather(
+                self.get_conversation_transcript(conversation_id),
+                self.get_conversation_summary(conversation_id)
+            )
             
             if not transcript:
                 return {}
             
+            speaker_counts = Counter(map(attrgetter("speaker"), transcript.messages))
             analytics = {
                 "conversation_info": {
                     "conversation_id": conversation_id,
@@ -233,9 +321,9 @@ class ConversationService:
                 },
                 "message_stats": {
                     "total_messages": len(transcript.messages),
-                    "user_messages": len([m for m in transcript.messages if m.speaker == "user"]),
-                    "bot_messages": len([m for m in transcript.messages if m.speaker == "bot"]),
-                    "system_messages": len([m for m in transcript.messages if m.speaker == "system"])
+                    "user_messages": speaker_counts["user"],
+                    "bot_messages": speaker_counts["bot"],
+                    "system_messages": speaker_counts["system"]
                 }
             }
             
@@ -259,8 +347,15 @@ class ConversationService:
     async def get_user_learning_progression(self, user_email: str) -> Dict[str, Any]:
         """Get user's learning progression across all conversations"""
         try:
-            summaries = await self.get_user_summaries(user_email)
-            transcripts = await self.get_user_conversations(user_email)
+            key = f"user_progression:{user_email}"
+            progression = _cache_get(key)
+            if progression is not None:
+                return progression
+            
+            summaries, transcripts = await asyncio.gather(
+                self.get_user_summaries(user_email),
+                self.get_user_conversations(user_email)
+            )
             
             if not summaries and not transcripts:
                 return {}
@@ -288,7 +383,7 @@ class ConversationService:
             avg_rating = sum(ratings) / len(ratings) if ratings else 0
             avg_session_time = total_session_time / session_count if session_count > 0 else 0
             
-            return {
+            progression = {
                 "user_email": user_email,
                 "learning_stats": {
                     "total_sessions": len(transcripts),
@@ -309,11 +404,42 @@ class ConversationService:
                     "recent_conversations": [t.conversation_id for t in transcripts[:5]]
                 }
             }
+            _cache_set(key, progression, ACTIVE_CONVERSATION_TTL_SECS)
+            return progression
             
         except Exception as e:
             logger.error(f"Error getting user learning progression for {user_email}: {e}")
             return {}
     
+    async def get_user_conversation_summary(self, user_email: str) -> Dict[str, Any]:
+        """Get the key metrics view of a user's progression, kept until their conversations change"""
+        key = f"user_summary:{user_email}"
+        summary = _cache_get(key)
+        if summary is not None:
+            return summary
+        
+        progression = await self.get_user_learning_progression(user_email)
+        if not progression:
+            return {}
+        
+        learning_stats = progression["learning_stats"]
+        performance = progression["performance"]
+        recent_activity = progression["recent_activity"]
+        summary = {
+            "user_email": user_email,
+            "total_conversations": learning_stats["total_sessions"],
+            "completed_conversations": learning_stats["completed_sessions"],
+            "total_words_learned": learning_stats["total_words_learned"],
+            "total_topics_covered": learning_stats["total_topics_covered"],
+            "total_learning_hours": performance["total_learning_time_hours"],
+            "average_session_minutes": performance["average_session_time_minutes"],
+            "average_performance": performance["average_rating"],
+            "last_session": recent_activity["last_session"],
+            "recent_conversations": recent_activity["recent_conversations"]
+        }
+        _cache_set(key, summary, ACTIVE_CONVERSATION_TTL_SECS)
+        return summary
+    
     async def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation and its summary"""
         try:
@@ -330,22 +456,29 @@ class ConversationService:
         except Exception as e:
             logger.error(f"Error deleting conversation {conversation_id}: {e}")
             return False
+        finally:
+            invalidate_conversation_cache(conversation_id)
     
     async def search_conversations(self, user_email: str, search_term: str) -> List[ConversationTranscript]:
         """Search user's conversations by content"""
         try:
-            conversations = await self.get_user_conversations(user_email)
             search_term_lower = search_term.lower()
-            
-            matching_conversations = []
-            for conversation in conversations:
-                # Search in messages
-                for message in conversation.messages:
-                    if search_term_lower in message.content.lower():
-                        matching_conversations.append(conversation)
-                        break
-            
-            return matching_conversations
+            corpus = await self._get_search_corpus(user_email)
+            return [conversation for text, conversation in corpus if search_term_lower in text]
         except Exception as e:
             logger.error(f"Error searching conversations for {user_email} with term '{search_term}': {e}")
             return []
+    
+    async def _get_search_corpus(self, user_email: str) -> List[Tuple[str, ConversationTranscript]]:
+        """Get each of the user's conversations with its lowercased message text, built once per cache lifetime"""
+        key = f"user_search:{user_email}"
+        corpus = _cache_get(key)
+        if corpus is None:
+            conversations = await self.get_user_conversations(user_email)
+            # NUL-separated so a search term can't match across two messages
+            corpus = [
+                ("\0".join(message.content for message in conversation.messages).lower(), conversation)
+                for conversation in conversations
+            ]
+            _cache_set(key, corpus, ACTIVE_CONVERSATION_TTL_SECS)
+        return corpus
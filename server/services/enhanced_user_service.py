@@ -2,12 +2,19 @@
 Enhanced User Service with comprehensive learning analytics
 """
 
-from typing import List, Dict, Optional, Any
+import asyncio
+from typing import List, Dict, Optional, Any, AsyncIterator
 from datetime import datetime, timedelta
 from loguru import logger
 
 from models.enhanced_user import EnhancedUser, UserStatus, Parent, Progress
 from services.firebase_service import FirebaseService
+from utils.exceptions import ServiceException
+
+# Last-active timestamps are coalesced per user here and written in one batch
+# per interval rather than one Firestore write per call
+LAST_ACTIVE_FLUSH_INTERVAL_SECS = 60.0
+_pending_last_active: Dict[str, datetime] = {}
 
 class EnhancedUserService:
     """Enhanced user service with comprehensive learning tracking"""
@@ -46,6 +53,8 @@ class EnhancedUserService:
             logger.info(f"Created enhanced user: {user.email}")
             return user
             
+        except KeyError as e:
+            raise ServiceException(f"Missing required user field: {e.args[0]}") from None
         except Exception as e:
             logger.error(f"Error creating enhanced user: {e}")
             raise
@@ -122,17 +131,39 @@ class EnhancedUserService:
             return False
     
     async def update_last_active(self, email: str) -> bool:
-        """Update user's last active timestamp"""
+        """Record user's last active timestamp; persisted by the next flush_last_active"""
+        _pending_last_active[email] = datetime.utcnow()
+        return True
+    
+    async def flush_last_active(self) -> int:
+        """Write buffered last-active timestamps to Firebase, returning how many were written"""
+        global _pending_last_active
+        pending, _pending_last_active = _pending_last_active, {}
+        if not pending:
+            return 0
+        
+        updates = {email: {"last_active": last_active} for email, last_active in pending.items()}
         try:
-            await self.firebase.update_document(
-                self.collection_name,
-                email,
-                {"last_active": datetime.utcnow()}
-            )
-            return True
+            await self.firebase.update_documents(self.collection_name, updates)
+            return len(updates)
         except Exception as e:
-            logger.error(f"Error updating last active for {email}: {e}")
-            return False
+            # A batch fails as a whole (e.g. one unknown user), so retry one by one
+            logger.warning(f"Batched last active update failed, retrying individually: {e}")
+        
+        written = 0
+        for email, data in updates.items():
+            try:
+                await self.firebase.update_document(self.collection_name, email, data)
+                written += 1
+            except Exception as e:
+                logger.error(f"Error updating last active for {email}: {e}")
+        return written
+    
+    async def run_last_active_flusher(self, interval: float = LAST_ACTIVE_FLUSH_INTERVAL_SECS):
+        """Flush buffered last-active timestamps every interval until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush_last_active()
     
     async def get_all_users(self) -> List[EnhancedUser]:
         """Get all users"""
@@ -143,6 +174,14 @@ class EnhancedUserService:
             logger.error(f"Error getting all users: {e}")
             return []
     
+    async def iter_all_users(self) -> AsyncIterator[EnhancedUser]:
+        """Yield all users without loading the whole collection first"""
+        try:
+            async for data in self.firebase.stream_documents(self.collection_name):
+                yield EnhancedUser.from_dict(data)
+        except Exception as e:
+            logger.error(f"Error streaming all users: {e}")
+    
     async def get_users_by_status(self, status: UserStatus) -> List[EnhancedUser]:
         """Get users by status"""
         try:
@@ -2,13 +2,50 @@
 Episode Prompt Service for managing learning content
 """
 
-from typing import List, Dict, Optional, Any
+import time
+from collections import Counter
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 from loguru import logger
 
 from models.episode_prompt import EpisodePrompt
 from services.firebase_service import FirebaseService
 
+# In-process read cache for episode prompts and episode lists. Episodes change
+# rarely, so any write through this service drops the whole cache; the TTL
+# bounds staleness from writes made by other workers. Cached episodes and
+# lists are shared between requests and must not be mutated by callers
+EPISODE_CACHE_TTL_SECS = 60.0
+# Keys include caller-supplied path params, so the cache is capped
+EPISODE_CACHE_MAX_ENTRIES = 1024
+_episode_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cache_get(key: str) -> Any:
+    """Get a cached value, or None if it is missing or expired"""
+    entry = _episode_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _episode_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_set(key: str, value: Any) -> None:
+    """Cache a value for EPISODE_CACHE_TTL_SECS, evicting the oldest entry when the cache is full"""
+    _episode_cache.pop(key, None)
+    if len(_episode_cache) >= EPISODE_CACHE_MAX_ENTRIES:
+        _episode_cache.pop(next(iter(_episode_cache)), None)
+    _episode_cache[key] = (time.monotonic() + EPISODE_CACHE_TTL_SECS, value)
+
+
+def invalidate_episode_cache() -> None:
+    """Drop every cached episode read"""
+    _episode_cache.clear()
+
+
 class EpisodePromptService:
     """Service for managing episode prompts and learning content"""
     
@@ -39,6 +76,7 @@ class EpisodePromptService:
                 doc_id,
                 episode_prompt.to_dict()
             )
+            invalidate_episode_cache()
             
             logger.info(f"Created episode prompt: {doc_id}")
             return episode_prompt
@@ -51,9 +89,14 @@ class EpisodePromptService:
         """Get episode prompt by season and episode"""
         try:
             doc_id = f"S{season}E{episode}"
+            cached = _cache_get(f"episode:{doc_id}")
+            if cached is not None:
+                return cached
             data = await self.firebase.get_document(self.collection_name, doc_id)
             if data:
-                return EpisodePrompt.from_dict(data)
+                episode_prompt = EpisodePrompt.from_dict(data)
+                _cache_set(f"episode:{doc_id}", episode_prompt)
+                return episode_prompt
             return None
         except Exception as e:
             logger.error(f"Error getting episode prompt S{season}E{episode}: {e}")
@@ -62,6 +105,10 @@ class EpisodePromptService:
     async def get_season_episodes(self, season: int) -> List[EpisodePrompt]:
         """Get all episodes for a specific season"""
         try:
+            cache_key = f"season:{season}"
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
             episodes_data = await self.firebase.query_collection(
                 self.collection_name,
                 [("season", "==", season)]
@@ -69,6 +116,9 @@ class EpisodePromptService:
             episodes = [EpisodePrompt.from_dict(data) for data in episodes_data]
             # Sort by episode number
             episodes.sort(key=lambda x: x.episode)
+            # Unknown seasons aren't cached, so arbitrary path params can't fill the cache
+            if episodes:
+                _cache_set(cache_key, episodes)
             return episodes
         except Exception as e:
             logger.error(f"Error getting season {season} episodes: {e}")
@@ -77,6 +127,10 @@ class EpisodePromptService:
     async def get_episodes_by_difficulty(self, difficulty_level: str) -> List[EpisodePrompt]:
         """Get episodes by difficulty level"""
         try:
+            cache_key = f"difficulty:{difficulty_level}"
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
             episodes_data = await self.firebase.query_collection(
                 self.collection_name,
                 [("difficulty_level", "==", difficulty_level)]
@@ -84,6 +138,9 @@ class EpisodePromptService:
             episodes = [EpisodePrompt.from_dict(data) for data in episodes_data]
             # Sort by season and episode
             episodes.sort(key=lambda x: (x.season, x.episode))
+            # Unknown values aren't cached, so arbitrary path params can't fill the cache
+            if episodes:
+                _cache_set(cache_key, episodes)
             return episodes
         except Exception as e:
             logger.error(f"Error getting episodes by difficulty {difficulty_level}: {e}")
@@ -92,6 +149,10 @@ class EpisodePromptService:
     async def get_episodes_by_age_group(self, age_group: str) -> List[EpisodePrompt]:
         """Get episodes by age group"""
         try:
+            cache_key = f"age_group:{age_group}"
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
             episodes_data = await self.firebase.query_collection(
                 self.collection_name,
                 [("age_group", "==", age_group)]
@@ -99,6 +160,9 @@ class EpisodePromptService:
             episodes = [EpisodePrompt.from_dict(data) for data in episodes_data]
             # Sort by season and episode
             episodes.sort(key=lambda x: (x.season, x.episode))
+            # Unknown values aren't cached, so arbitrary path params can't fill the cache
+            if episodes:
+                _cache_set(cache_key, episodes)
             return episodes
         except Exception as e:
             logger.error(f"Error getting episodes by age group {age_group}: {e}")
@@ -115,6 +179,7 @@ class EpisodePromptService:
                 doc_id,
                 updates
             )
+            invalidate_episode_cache()
             
             logger.info(f"Updated episode prompt: {doc_id}")
             return True
@@ -126,25 +191,27 @@ class EpisodePromptService:
     async def record_usage(self, season: int, episode: int, user_email: str, session_data: Dict[str, Any]) -> bool:
         """Record usage of an episode prompt"""
         try:
-            episode_prompt = await self.get_episode_prompt(season, episode)
-            if not episode_prompt:
-                logger.warning(f"Episode S{season}E{episode} not found for usage recording")
-                return False
-            
-            episode_prompt.record_usage(
-                user_email,
-                session_data.get("words_learned", []),
-                session_data.get("topics_covered", []),
-                session_data.get("session_time", 0.0),
-                session_data.get("completion_rating", 5)
-            )
-            
+            # One write of server-side increments and unions: no read, and
+            # concurrent sessions can't overwrite each other's counts
             doc_id = f"S{season}E{episode}"
-            await self.firebase.update_document(
+            now = datetime.utcnow()
+            await self.firebase.update_document_atomic(
                 self.collection_name,
                 doc_id,
-                episode_prompt.to_dict()
+                increments={
+                    "total_uses": 1,
+                    "total_time_spent": session_data.get("session_time", 0.0),
+                    "rating_total": session_data.get("completion_rating", 5),
+                    "rating_count": 1
+                },
+                array_unions={
+                    "users_completed": [user_email],
+                    "words_taught": session_data.get("words_learned", []),
+                    "topics_taught": session_data.get("topics_covered", [])
+                },
+                values={"last_used": now, "updated_at": now}
             )
+            invalidate_episode_cache()
             
             logger.info(f"Recorded usage for {doc_id} by {user_email}")
             return True
@@ -196,25 +263,122 @@ class EpisodePromptService:
             logger.error(f"Error getting episode analytics for S{season}E{episode}: {e}")
             return {}
     
+    async def get_episode_summary(self, season: int, episode: int) -> Dict[str, Any]:
+        """Get episode summary with key metrics, derived once and cached until the next write"""
+        cache_key = f"summary:S{season}E{episode}"
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        episode_prompt = await self.get_episode_prompt(season, episode)
+        if not episode_prompt:
+            return {}
+        
+        summary = {
+            "episode_id": f"S{season}E{episode}",
+            "title": episode_prompt.title,
+            "difficulty_level": episode_prompt.difficulty_level,
+            "age_group": episode_prompt.age_group,
+            "words_count": len(episode_prompt.words_to_teach),
+            "topics_count": len(episode_prompt.topics_to_cover),
+            "objectives_count": len(episode_prompt.learning_objectives),
+            "total_uses": episode_prompt.total_uses,
+            "unique_users": len(episode_prompt.users_completed),
+            "average_session_time_minutes": round(episode_prompt.average_session_time / 60, 2),
+            "average_rating": round(episode_prompt.average_rating, 2),
+            "words_taught_count": len(episode_prompt.words_taught),
+            "topics_taught_count": len(episode_prompt.topics_taught),
+            "created_at": episode_prompt.created_at,
+            "last_used": episode_prompt.last_used
+        }
+        # Firestore hands back DatetimeWithNanoseconds, a datetime subclass orjson
+        # refuses, so timestamps are cached already in their ISO form
+        for key in ("created_at", "last_used"):
+            if isinstance(summary[key], datetime):
+                summary[key] = summary[key].isoformat()
+        _cache_set(cache_key, summary)
+        return summary
+    
     async def get_all_episodes(self) -> List[EpisodePrompt]:
         """Get all episode prompts"""
         try:
+            cached = _cache_get("all")
+            if cached is not None:
+                return cached
             episodes_data = await self.firebase.get_all_documents(self.collection_name)
             episodes = [EpisodePrompt.from_dict(data) for data in episodes_data]
             # Sort by season and episode
             episodes.sort(key=lambda x: (x.season, x.episode))
+            _cache_set("all", episodes)
             return episodes
         except Exception as e:
             logger.error(f"Error getting all episodes: {e}")
             return []
     
+    async def get_episodes_overview(self) -> Dict[str, Any]:
+        """Get overview statistics for all episodes, aggregated in one pass and cached until the next write"""
+        cached = _cache_get("overview")
+        if cached is not None:
+            return cached
+        
+        episodes = await self.get_all_episodes()
+        if not episodes:
+            return {
+                "total_episodes": 0,
+                "total_seasons": 0,
+                "total_uses": 0,
+                "total_unique_users": 0
+            }
+        
+        seasons = set()
+        all_users = set()
+        difficulty_stats = Counter()
+        age_group_stats = Counter()
+        total_uses = 0
+        for episode in episodes:
+            seasons.add(episode.season)
+            all_users.update(episode.users_completed)
+            difficulty_stats[episode.difficulty_level] += 1
+            age_group_stats[episode.age_group] += 1
+            total_uses += episode.total_uses
+        
+        total_episodes = len(episodes)
+        overview = {
+            "total_episodes": total_episodes,
+            "total_seasons": len(seasons),
+            "total_uses": total_uses,
+            "total_unique_users": len(all_users),
+            "difficulty_distribution": dict(difficulty_stats),
+            "age_group_distribution": dict(age_group_stats),
+            "average_uses_per_episode": round(total_uses / total_episodes, 2)
+        }
+        _cache_set("overview", overview)
+        return overview
+    
     async def get_popular_episodes(self, limit: int = 10) -> List[EpisodePrompt]:
         """Get most popular episodes by usage"""
         try:
-            episodes = await self.get_all_episodes()
-            # Sort by total uses descending
-            episodes.sort(key=lambda x: x.total_uses, reverse=True)
-            return episodes[:limit]
+            cache_key = f"popular:{limit}"
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            all_episodes = _cache_get("all")
+            if all_episodes is not None:
+                # Sort by total uses descending; the cached list itself stays in season order
+                episodes = sorted(all_episodes, key=lambda x: x.total_uses, reverse=True)[:limit]
+            else:
+                # Only the top documents cross the wire, via the automatic total_uses index
+                episodes_data = await self.firebase.query_collection(
+                    self.collection_name,
+                    [],
+                    order_by="total_uses",
+                    descending=True,
+                    limit=limit
+                )
+                episodes = [EpisodePrompt.from_dict(data) for data in episodes_data]
+            _cache_set(cache_key, episodes)
+            return episodes
         except Exception as e:
             logger.error(f"Error getting popular episodes: {e}")
             return []
@@ -224,6 +388,7 @@ class EpisodePromptService:
         try:
             doc_id = f"S{season}E{episode}"
             await self.firebase.delete_document(self.collection_name, doc_id)
+            invalidate_episode_cache()
             logger.info(f"Deleted episode prompt: {doc_id}")
             return True
         except Exception as e:
@@ -231,35 +396,29 @@ class EpisodePromptService:
             return False
     
     async def search_episodes(self, search_term: str) -> List[EpisodePrompt]:
-        """Search episodes by title, words, or topics"""
+        """Search episodes by title, words, topics, or learning objectives"""
         try:
-            # Get all episodes and filter locally (Firestore full-text search is limited)
-            episodes = await self.get_all_episodes()
             search_term_lower = search_term.lower()
-            
-            matching_episodes = []
-            for episode in episodes:
-                # Search in title
-                if search_term_lower in episode.title.lower():
-                    matching_episodes.append(episode)
-                    continue
-                
-                # Search in words to teach
-                if any(search_term_lower in word.lower() for word in episode.words_to_teach):
-                    matching_episodes.append(episode)
-                    continue
-                
-                # Search in topics to cover
-                if any(search_term_lower in topic.lower() for topic in episode.topics_to_cover):
-                    matching_episodes.append(episode)
-                    continue
-                
-                # Search in learning objectives
-                if any(search_term_lower in obj.lower() for obj in episode.learning_objectives):
-                    matching_episodes.append(episode)
-                    continue
-            
-            return matching_episodes
+            corpus = await self._get_search_corpus()
+            return [episode for text, episode in corpus if search_term_lower in text]
         except Exception as e:
             logger.error(f"Error searching episodes with term '{search_term}': {e}")
             return []
+    
+    async def _get_search_corpus(self) -> List[Tuple[str, EpisodePrompt]]:
+        """Get every episode with its lowercased searchable text, built once per cache lifetime"""
+        corpus = _cache_get("search_corpus")
+        if corpus is None:
+            episodes = await self.get_all_episodes()
+            # NUL-separated so a search term can't match across two fields or list items
+            corpus = [
+                ("\0".join([
+                    episode.title,
+                    *episode.words_to_teach,
+                    *episode.topics_to_cover,
+                    *episode.learning_objectives
+                ]).lower(), episode)
+                for episode in episodes
+            ]
+            _cache_set("search_corpus", corpus)
+        return corpus
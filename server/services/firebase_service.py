@@ -3,7 +3,7 @@ Simplified Firebase service for handling database operations
 """
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 import json
 import os
 from loguru import logger
@@ -17,6 +17,9 @@ class FirebaseService:
     def __init__(self):
         self.settings = get_settings()
         self.db = None
+        # Native async client used by this service's own operations; db stays
+        # for callers that still drive the sync client themselves
+        self.async_db = None
         self.use_firebase = False
         
         # In-memory storage for when Firebase is not available
@@ -30,7 +33,7 @@ class FirebaseService:
             # Try to initialize Firebase if credentials exist
             if os.path.exists(self.settings.firebase_credentials_path):
                 import firebase_admin
-                from firebase_admin import credentials, firestore
+                from firebase_admin import credentials, firestore, firestore_async
                 
                 try:
                     firebase_admin.get_app()
@@ -41,6 +44,7 @@ class FirebaseService:
                     logger.info("Firebase initialized successfully")
                 
                 self.db = firestore.client()
+                self.async_db = firestore_async.client()
                 self.use_firebase = True
                 logger.info("✅ Firebase Firestore connected")
             else:
@@ -58,10 +62,7 @@ class FirebaseService:
         """Set a document in a collection"""
         try:
             if self.use_firebase:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.db.collection(collection).document(document_id).set(data)
-                )
+                await self.async_db.collection(collection).document(document_id).set(data)
             else:
                 # Use in-memory storage with collection namespacing
                 if collection not in self._storage:
@@ -77,8 +78,7 @@ class FirebaseService:
         """Get a document from a collection"""
         try:
             if self.use_firebase:
-                doc_ref = self.db.collection(collection).document(document_id)
-                doc = await asyncio.get_event_loop().run_in_executor(None, doc_ref.get)
+                doc = await self.async_db.collection(collection).document(document_id).get()
                 if doc.exists:
                     return doc.to_dict()
                 return None
@@ -90,14 +90,32 @@ class FirebaseService:
             logger.error(f"Failed to get document {collection}/{document_id}: {e}")
             return None
 
+    async def get_documents(self, collection: str, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several documents from a collection in one round trip, keyed by document ID"""
+        if not document_ids:
+            return {}
+        try:
+            if self.use_firebase:
+                doc_refs = [self.async_db.collection(collection).document(document_id) for document_id in document_ids]
+                docs = [doc async for doc in self.async_db.get_all(doc_refs)]
+                return {doc.id: doc.to_dict() for doc in docs if doc.exists}
+            else:
+                # Get from in-memory storage
+                collection_data = self._storage.get(collection, {})
+                return {
+                    document_id: collection_data[document_id]
+                    for document_id in document_ids
+                    if document_id in collection_data
+                }
+        except Exception as e:
+            logger.error(f"Failed to get documents from {collection}: {e}")
+            return {}
+
     async def update_document(self, collection: str, document_id: str, data: Dict[str, Any]) -> None:
         """Update a document in a collection"""
         try:
             if self.use_firebase:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.db.collection(collection).document(document_id).update(data)
-                )
+                await self.async_db.collection(collection).document(document_id).update(data)
             else:
                 # Update in-memory storage
                 if collection not in self._storage:
@@ -112,14 +130,78 @@ class FirebaseService:
             logger.error(f"Failed to update document {collection}/{document_id}: {e}")
             raise e
 
+    async def update_document_atomic(
+        self,
+        collection: str,
+        document_id: str,
+        increments: Optional[Dict[str, float]] = None,
+        array_unions: Optional[Dict[str, List[Any]]] = None,
+        values: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Apply increments, array unions and plain values to an existing document in one write, without reading it"""
+        try:
+            if self.use_firebase:
+                from firebase_admin import firestore
+                
+                data = dict(values or {})
+                for field, amount in (increments or {}).items():
+                    data[field] = firestore.Increment(amount)
+                for field, items in (array_unions or {}).items():
+                    if items:
+                        data[field] = firestore.ArrayUnion(list(items))
+                
+                # update() fails with NotFound for a missing document, like the in-memory branch
+                await self.async_db.collection(collection).document(document_id).update(data)
+            else:
+                doc_data = self._storage.get(collection, {}).get(document_id)
+                if doc_data is None:
+                    raise KeyError(f"Document not found: {collection}/{document_id}")
+                for field, amount in (increments or {}).items():
+                    doc_data[field] = doc_data.get(field, 0) + amount
+                for field, items in (array_unions or {}).items():
+                    existing = doc_data.setdefault(field, [])
+                    existing.extend(item for item in dict.fromkeys(items) if item not in existing)
+                doc_data.update(values or {})
+            
+            logger.info(f"Document updated atomically: {collection}/{document_id}")
+        except Exception as e:
+            logger.error(f"Failed to atomically update document {collection}/{document_id}: {e}")
+            raise e
+
+    async def update_documents(self, collection: str, updates: Dict[str, Dict[str, Any]]) -> None:
+        """Update several documents in a collection with batched writes"""
+        if not updates:
+            return
+        try:
+            if self.use_firebase:
+                # Firestore batches are capped at 500 writes each; they commit concurrently
+                items = list(updates.items())
+                batches = []
+                for start in range(0, len(items), 500):
+                    batch = self.async_db.batch()
+                    for document_id, data in items[start:start + 500]:
+                        batch.update(self.async_db.collection(collection).document(document_id), data)
+                    batches.append(batch.commit())
+                await asyncio.gather(*batches)
+            else:
+                # Update in-memory storage
+                collection_data = self._storage.setdefault(collection, {})
+                for document_id, data in updates.items():
+                    if document_id in collection_data:
+                        collection_data[document_id].update(data)
+                    else:
+                        collection_data[document_id] = data
+            
+            logger.info(f"Documents updated: {collection} ({len(updates)})")
+        except Exception as e:
+            logger.error(f"Failed to update documents in {collection}: {e}")
+            raise e
+
     async def delete_document(self, collection: str, document_id: str) -> None:
         """Delete a document from a collection"""
         try:
             if self.use_firebase:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.db.collection(collection).document(document_id).delete()
-                )
+                await self.async_db.collection(collection).document(document_id).delete()
             else:
                 # Delete from in-memory storage
                 if collection in self._storage and document_id in self._storage[collection]:
@@ -130,15 +212,29 @@ class FirebaseService:
             logger.error(f"Failed to delete document {collection}/{document_id}: {e}")
             raise e
 
-    async def query_collection(self, collection: str, filters: List[tuple]) -> List[Dict[str, Any]]:
-        """Query a collection with filters"""
+    async def query_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Query a collection with filters, optionally ordered and limited server-side"""
         try:
             if self.use_firebase:
-                query = self.db.collection(collection)
+                from firebase_admin import firestore
+                
+                query = self.async_db.collection(collection)
                 for field, operator, value in filters:
                     query = query.where(field, operator, value)
+                if order_by is not None:
+                    direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+                    query = query.order_by(order_by, direction=direction)
+                if limit is not None:
+                    query = query.limit(limit)
                 
-                docs = await asyncio.get_event_loop().run_in_executor(None, query.get)
+                docs = await query.get()
                 return [doc.to_dict() for doc in docs]
             else:
                 # Simple in-memory filtering
@@ -159,6 +255,12 @@ class FirebaseService:
                             break
                     if match:
                         results.append(doc_data)
+                if order_by is not None:
+                    # Firestore leaves out documents without the ordering field
+                    results = [doc_data for doc_data in results if order_by in doc_data]
+                    results.sort(key=lambda doc_data: doc_data[order_by], reverse=descending)
+                if limit is not None:
+                    results = results[:limit]
                 return results
         except Exception as e:
             logger.error(f"Failed to query collection {collection}: {e}")
@@ -168,10 +270,7 @@ class FirebaseService:
         """Get all documents from a collection"""
         try:
             if self.use_firebase:
-                docs = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.db.collection(collection).get()
-                )
+                docs = await self.async_db.collection(collection).get()
                 return [doc.to_dict() for doc in docs]
             else:
                 # Get all from in-memory storage
@@ -181,15 +280,21 @@ class FirebaseService:
             logger.error(f"Failed to get all documents from {collection}: {e}")
             return []
 
+    async def stream_documents(self, collection: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every document in a collection as the server streams it"""
+        if self.use_firebase:
+            async for doc in self.async_db.collection(collection).stream():
+                yield doc.to_dict()
+        else:
+            for doc_data in list(self._storage.get(collection, {}).values()):
+                yield doc_data
+
     async def health_check(self) -> bool:
         """Check if the service is healthy"""
         try:
             if self.use_firebase:
                 # Try a simple read operation
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.db.collection('health_check').limit(1).get()
-                )
+                await self.async_db.collection('health_check').limit(1).get()
             return True
         except Exception:
             return False
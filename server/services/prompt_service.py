@@ -38,28 +38,7 @@ class PromptService(LoggerMixin):
         Returns:
             SystemPromptResponse: Created/updated prompt response
         """
-        # Validate season and episode
-        is_valid, error_msg = PromptValidator.validate_season_episode(
-            prompt_request.season, prompt_request.episode
-        )
-        if not is_valid:
-            raise ValidationException(error_msg)
-        
-        # Validate prompt content
-        is_valid, error_msg = PromptValidator.validate_prompt_content(prompt_request.prompt)
-        if not is_valid:
-            raise ValidationException(error_msg)
-        
-        # Create prompt object
-        prompt = SystemPrompt(
-            season=prompt_request.season,
-            episode=prompt_request.episode,
-            prompt=prompt_request.prompt,
-            prompt_type=prompt_request.prompt_type,
-            metadata=prompt_request.metadata or {},
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
+        prompt = self._build_prompt(prompt_request)
         
         # Store prompt
         prompt_key = self._get_prompt_key(prompt.season, prompt.episode)
@@ -86,6 +65,46 @@ class PromptService(LoggerMixin):
         self.log_info(f"System prompt created: Season {prompt.season}, Episode {prompt.episode}")
         return SystemPromptResponse.from_system_prompt(prompt)
     
+    async def create_system_prompts(self, prompt_requests: List[SystemPromptRequest]) -> List[SystemPromptResponse]:
+        """
+        Create or update several system prompts in one write
+        
+        Args:
+            prompt_requests: Prompt creation requests
+            
+        Returns:
+            List[SystemPromptResponse]: Created/updated prompt responses, in request order
+        """
+        # Validate everything up front so the batch is all-or-nothing
+        prompts = [self._build_prompt(prompt_request) for prompt_request in prompt_requests]
+        
+        if self.firebase_service.use_firebase:
+            # Firestore batches are capped at 500 writes each
+            def commit_batches():
+                db = self.firebase_service.db
+                for start in range(0, len(prompts), 500):
+                    batch = db.batch()
+                    for prompt in prompts[start:start + 500]:
+                        doc_ref = db.collection('prompts').document(self._get_prompt_key(prompt.season, prompt.episode))
+                        batch.set(doc_ref, self._prompt_to_dict(prompt))
+                    batch.commit()
+            
+            try:
+                import asyncio
+                await asyncio.get_event_loop().run_in_executor(None, commit_batches)
+            except Exception as e:
+                self.log_error(f"Failed to batch-save prompts to Firebase: {e}")
+                # Fall back to in-memory storage
+                for prompt in prompts:
+                    self._prompts[self._get_prompt_key(prompt.season, prompt.episode)] = prompt
+        else:
+            # Store in memory
+            for prompt in prompts:
+                self._prompts[self._get_prompt_key(prompt.season, prompt.episode)] = prompt
+        
+        self.log_info(f"System prompts created in bulk: {len(prompts)}")
+        return [SystemPromptResponse.from_system_prompt(prompt) for prompt in prompts]
+    
     async def get_system_prompt(self, season: int, episode: int) -> SystemPromptResponse:
         """
         Get system prompt for specific season and episode
@@ -400,6 +419,31 @@ class PromptService(LoggerMixin):
             }
         }
     
+    def _build_prompt(self, prompt_request: SystemPromptRequest) -> SystemPrompt:
+        """Validate a prompt request and build the SystemPrompt to store"""
+        # Validate season and episode
+        is_valid, error_msg = PromptValidator.validate_season_episode(
+            prompt_request.season, prompt_request.episode
+        )
+        if not is_valid:
+            raise ValidationException(error_msg)
+        
+        # Validate prompt content
+        is_valid, error_msg = PromptValidator.validate_prompt_content(prompt_request.prompt)
+        if not is_valid:
+            raise ValidationException(error_msg)
+        
+        # Create prompt object
+        return SystemPrompt(
+            season=prompt_request.season,
+            episode=prompt_request.episode,
+            prompt=prompt_request.prompt,
+            prompt_type=prompt_request.prompt_type,
+            metadata=prompt_request.metadata or {},
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+    
     def _prompt_to_dict(self, prompt: SystemPrompt) -> Dict[str, Any]:
         """Convert SystemPrompt to dictionary"""
         # Handle both enum and string prompt_type values
@@ -5,8 +5,13 @@ Test script to validate our enhanced API endpoints
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 
+# Shared session so every request reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 def test_endpoints():
     """Test the enhanced API endpoints"""
     base_url = "http://localhost:7860"
@@ -17,7 +22,7 @@ def test_endpoints():
     try:
         # Test root endpoint
         print("\n1. Testing root endpoint...")
-        response = requests.get(f"{base_url}/")
+        response = SESSION.get(f"{base_url}/")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Root endpoint works - Server: {data.get('message', 'Unknown')}")
@@ -27,7 +32,7 @@ def test_endpoints():
         
         # Test health endpoint
         print("\n2. Testing health endpoint...")
-        response = requests.get(f"{base_url}/health")
+        response = SESSION.get(f"{base_url}/health")
         if response.status_code == 200:
             health = response.json()
             print(f"✅ Health check works - Status: {health.get('status', 'Unknown')}")
@@ -37,7 +42,7 @@ def test_endpoints():
         
         # Test docs endpoint
         print("\n3. Testing documentation endpoint...")
-        response = requests.get(f"{base_url}/docs")
+        response = SESSION.get(f"{base_url}/docs")
         if response.status_code == 200:
             print("✅ FastAPI docs endpoint works")
         else:
@@ -45,17 +50,17 @@ def test_endpoints():
         
         # Test enhanced users endpoint structure
         print("\n4. Testing enhanced users endpoint structure...")
-        response = requests.get(f"{base_url}/users/")
+        response = SESSION.get(f"{base_url}/users/")
         print(f"   Enhanced Users endpoint: {response.status_code} (expected 200 if no users)")
         
         # Test episodes endpoint structure  
         print("\n5. Testing episodes endpoint structure...")
-        response = requests.get(f"{base_url}/episodes/")
+        response = SESSION.get(f"{base_url}/episodes/")
         print(f"   Episodes endpoint: {response.status_code} (expected 200 if no episodes)")
         
         # Test conversations endpoint structure
         print("\n6. Testing conversations endpoint structure...")
-        response = requests.get(f"{base_url}/conversations/stats/overview")
+        response = SESSION.get(f"{base_url}/conversations/stats/overview")
         print(f"   Conversations endpoint: {response.status_code} (expected 200)")
         
         print("\n🎉 API endpoint validation complete!")
@@ -4,26 +4,39 @@ Test script for Enhanced Pipecat Server endpoints
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 
 BASE_URL = "http://127.0.0.1:7860"
 
+# Shared session so every request reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Request senders by verb; GETs carry no body
+_VERBS = {
+    "GET": lambda url, data: SESSION.get(url),
+    "POST": lambda url, data: SESSION.post(url, json=data),
+    "PUT": lambda url, data: SESSION.put(url, json=data),
+    "DELETE": lambda url, data: SESSION.delete(url),
+}
+
 def test_endpoint(method, endpoint, data=None, expected_status=200):
     """Test an endpoint and return result"""
     url = f"{BASE_URL}{endpoint}"
+    method = method.upper()
     
     try:
-        if method.upper() == "GET":
-            response = requests.get(url)
-        elif method.upper() == "POST":
-            response = requests.post(url, json=data)
+        send = _VERBS.get(method)
+        if send is not None:
+            response = send(url, data)
         else:
-            response = requests.request(method, url, json=data)
+            response = SESSION.request(method, url, json=data)
         
         success = response.status_code == expected_status
         
-        print(f"{'✅' if success else '❌'} {method.upper()} {endpoint}")
+        print(f"{'✅' if success else '❌'} {method} {endpoint}")
         print(f"   Status: {response.status_code}")
         
         try:
@@ -36,7 +49,7 @@ def test_endpoint(method, endpoint, data=None, expected_status=200):
         return success
         
     except Exception as e:
-        print(f"❌ {method.upper()} {endpoint}")
+        print(f"❌ {method} {endpoint}")
         print(f"   Error: {e}")
         print()
         return False
@@ -3,15 +3,21 @@ Utilities package - simplified version
 """
 
 import logging
+import sys
 from loguru import logger as loguru_logger
 
 
 def setup_logging(level="INFO"):
     """Setup logging configuration"""
     loguru_logger.remove()
+    # enqueue hands records to a background thread so request handlers never
+    # block on stderr writes
     loguru_logger.add(
-        sink=lambda message: print(message, end=""),
+        sink=sys.stderr,
         level=level,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
     )
     return loguru_logger
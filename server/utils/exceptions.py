@@ -70,6 +70,14 @@ class SecurityException(Exception):
         super().__init__(self.message)
 
 
+class ServiceException(Exception):
+    """Raised by services for expected failures that map straight to an HTTP status"""
+    def __init__(self, message: str, status_code: int = 400):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+
 # Error handlers
 def handle_validation_error(exc: ValidationException) -> dict:
     """Handle validation errors"""
@@ -0,0 +1,35 @@
+"""
+HTTP validator helpers for conditional GET responses
+"""
+import hashlib
+from typing import Callable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether If-None-Match already names this ETag, compared weakly as GET allows"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def conditional_response(request: Request, etag: str, cache_control: str, build: Callable[[], Response]) -> Response:
+    """Send 304 if the client holds this version, otherwise build the response; both carry the validators"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response = build()
+    response.headers.update(headers)
+    return response
+
+
+def etag_response(request: Request, body: bytes, cache_control: str) -> Response:
+    """Send a JSON body with an ETag over its bytes, or 304 if the client already holds it"""
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return conditional_response(request, etag, cache_control, lambda: Response(body, media_type="application/json"))
@@ -2,8 +2,11 @@
 Validators for input validation
 """
 import re
+from functools import lru_cache
 from typing import Optional
 
+from email_validator import EmailNotValidError, validate_email
+
 
 class DeviceValidator:
     """Device ID validation utilities"""
@@ -172,3 +175,27 @@ class SecurityValidator:
             return False, "Age must be between 1 and 120"
         
         return True, None
+
+
+class EmailValidator:
+    """Email validation utilities"""
+    
+    @staticmethod
+    @lru_cache(maxsize=10_000)
+    def normalize_email(email: str) -> Optional[str]:
+        """
+        Validate an email address and return its normalized form
+        
+        Results are cached per raw string, so repeat requests for the same
+        user skip the syntax check. Deliverability (DNS) is never checked.
+        
+        Args:
+            email: Email address to validate
+            
+        Returns:
+            Optional[str]: Normalized email, or None if invalid
+        """
+        try:
+            return validate_email(email, check_deliverability=False).normalized
+        except EmailNotValidError:
+            return None
@@ -14,12 +14,14 @@ import json
 # Import our auth components
 from server.models.auth_models import ClaimToken, DeviceRegistration, DeviceSession, UserDeviceBinding
 from server.services.auth_service import AuthenticationService
-from mock_firebase import MockFirebaseService
+from mock_firebase import AsyncMockFirebaseService
 
 app = FastAPI(title="Authentication Test Server", version="1.0.0")
 
 # Initialize auth service with mock firebase service
-mock_firebase = MockFirebaseService()
+mock_firebase = AsyncMockFirebaseService()
+mock_firebase.create_index("device_sessions", "status")
+mock_firebase.create_index("user_device_bindings", "email")
 auth_service = AuthenticationService(firebase_service=mock_firebase)
 
 @app.get("/")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Check that conversation transcripts serialize to JSON with Firestore-style timestamps
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+import orjson
+
+# Add the server directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'server'))
+
+class FirestoreDatetime(datetime):
+    """Stand-in for Firestore's DatetimeWithNanoseconds, a datetime subclass"""
+
+def test_transcript_round_trip():
+    """Round-trip a transcript whose message timestamps are datetime subclasses"""
+    from models.conversation import ConversationTranscript
+    
+    timestamp = FirestoreDatetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    stored = {
+        "conversation_id": "alex@example.com_1_1_1714566615",
+        "user_email": "alex@example.com",
+        "season": 1,
+        "episode": 1,
+        "messages": [
+            {"speaker": "user", "content": "hello", "message_type": "text", "timestamp": timestamp},
+            {"speaker": "bot", "content": "hi there", "message_type": "text", "timestamp": datetime(2024, 5, 1, 12, 30, 16)},
+        ],
+        "start_time": "2024-05-01T12:30:00",
+        "end_time": None,
+        "duration_seconds": None,
+        "status": "active",
+    }
+    
+    transcript = ConversationTranscript.from_dict(stored)
+    body = orjson.loads(transcript.to_json_bytes())
+    
+    assert body["conversation_id"] == stored["conversation_id"]
+    assert [message["content"] for message in body["messages"]] == ["hello", "hi there"]
+    assert body["messages"][0]["timestamp"] == timestamp.isoformat()
+    assert body["messages"][1]["timestamp"] == "2024-05-01T12:30:16"
+    assert datetime.fromisoformat(body["messages"][0]["timestamp"]) == timestamp
+    print("✅ Transcript with Firestore timestamps serializes and parses back")
+
+def test_message_dicts_are_copies():
+    """Mutating a returned dict must not leak into later serializations"""
+    from dataclasses import FrozenInstanceError
+    from models.conversation import ConversationTranscript, ConversationMessage
+    
+    transcript = ConversationTranscript("c1", "alex@example.com", 1, 1)
+    transcript.add_message(ConversationMessage("user", "hello"))
+    
+    transcript.to_dict()["messages"][0]["content"] = "changed"
+    transcript.messages[0].to_dict()["content"] = "changed"
+    assert transcript.to_dict()["messages"][0]["content"] == "hello"
+    assert orjson.loads(transcript.to_json_bytes())["messages"][0]["content"] == "hello"
+    
+    try:
+        transcript.messages[0].content = "changed"
+    except FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("ConversationMessage should be frozen")
+    print("✅ Message dicts are handed out as copies and messages are immutable")
+
+if __name__ == "__main__":
+    test_transcript_round_trip()
+    test_message_dicts_are_copies()
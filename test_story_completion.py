@@ -10,11 +10,16 @@ This script demonstrates the new story completion features:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 
 BASE_URL = "http://localhost:7860"
 
+# Shared session so every request reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 def register_test_user():
     """Register a test user for story completion demo"""
     print("🎭 Registering test user...")
@@ -31,7 +36,7 @@ def register_test_user():
         }
     }
     
-    response = requests.post(f"{BASE_URL}/users/create", json=user_data)
+    response = SESSION.post(f"{BASE_URL}/users/create", json=user_data)
     if response.status_code == 200:
         print("✅ User registered successfully!")
         print(f"   User: {user_data['name']} (Age {user_data['age']})")
@@ -47,7 +52,7 @@ def get_user_info(device_id):
     print(f"\n📊 Getting user info for {device_id}...")
     
     # Try the enhanced users device endpoint first
-    response = requests.get(f"{BASE_URL}/users/{device_id}")
+    response = SESSION.get(f"{BASE_URL}/users/{device_id}")
     if response.status_code == 200:
         user_info = response.json()
         progress = user_info.get('progress', {})
@@ -90,7 +95,7 @@ def complete_story_episode(device_id):
         "time_spent_minutes": 15.5
     }
     
-    response = requests.post(f"{BASE_URL}/api/complete-story", json=completion_data)
+    response = SESSION.post(f"{BASE_URL}/api/complete-story", json=completion_data)
     if response.status_code == 200:
         result = response.json()
         print("✅ Story episode completed!")
@@ -115,7 +120,7 @@ def advance_user_progress(device_id, advance_type="next_episode"):
         "advance_type": advance_type
     }
     
-    response = requests.post(f"{BASE_URL}/api/advance-progress", json=advance_data)
+    response = SESSION.post(f"{BASE_URL}/api/advance-progress", json=advance_data)
     if response.status_code == 200:
         result = response.json()
         print("✅ User progress advanced!")